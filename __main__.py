@@ -3,17 +3,24 @@ import pygame
 import draw as draw_module
 import state
 from custom_profile import profile
+from fixed_timestep import FixedTimestep
 
 @profile
 def main():
     pygame.init()
     draw_module.screen = pygame.display.set_mode((state.width, state.height))
-    state.draw_callback = draw_module.draw_state
+    world = simulation.default_world
+    state.draw_callback = lambda: draw_module.draw_state(world)
     clock = pygame.time.Clock()
+    timestep = FixedTimestep(
+        step_seconds=state.simulation_step_seconds,
+        substeps=state.substeps,
+        max_catch_up_steps=state.max_catch_up_steps,
+    )
     running = True
     dt = 0
 
-    simulation.setup()
+    simulation.setup(world)
     
     while running:
         # poll for events
@@ -22,10 +29,11 @@ def main():
             if event.type == pygame.QUIT:
                 running = False
 
-        simulation.simulate(dt)
-        state.draw_callback()
-        #wrap up
-        pygame.display.flip()
+        timestep.advance(dt, lambda step_dt: simulation.simulate(world, step_dt))
+        if timestep.should_render():
+            state.draw_callback()
+            #wrap up
+            pygame.display.flip()
         dt = clock.tick(60) / 1000
 
     pygame.quit()
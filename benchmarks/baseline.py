@@ -0,0 +1,136 @@
+"""Records timings of the key operations as a baseline and flags significant slowdowns against it.
+python -m benchmarks.baseline record [--output benchmarks/baseline.json]
+python -m benchmarks.baseline compare [--baseline benchmarks/baseline.json]
+compare exits with 1 if any operation got significantly slower, so it can fail a CI job.
+Timings only compare on the same machine, record the baseline where compare is going to run."""
+import argparse
+import json
+import math
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+import numpy as np
+from benchmarks.scaling import benchmark_world
+
+FORMAT_VERSION = 1
+DEFAULT_PATH = "benchmarks/baseline.json"
+DEFAULT_CONFIGURATION = {"blobs": 100, "link_length": 8.0, "repeats": 15}
+
+
+def git_commit()->Optional[str]:
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+def measure(configuration:Dict)->Dict[str, List[float]]:
+    """timing samples of every operation on a world of the given configuration"""
+    records = benchmark_world(configuration["blobs"], configuration["link_length"], configuration["repeats"])
+    return {record["operation"]: record["seconds"] for record in records}
+
+def record(configuration:Dict = DEFAULT_CONFIGURATION)->Dict:
+    samples = measure(configuration)
+    return {
+        "format_version": FORMAT_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "configuration": dict(configuration),
+        "operations": {
+            name: {"median_seconds": statistics.median(seconds), "samples": seconds}
+            for name, seconds in samples.items()
+        },
+    }
+
+def load(path:str)->Dict:
+    with open(path) as file:
+        baseline = json.load(file)
+    if baseline.get("format_version") != FORMAT_VERSION:
+        raise ValueError("Unsupported baseline format version, record it again", path, baseline.get("format_version"))
+    return baseline
+
+def slower_p_value(baseline:List[float], candidate:List[float])->float:
+    """one sided Mann-Whitney U test with the normal approximation and tie correction.
+    A small value means the candidate samples are very unlikely to come from a distribution that isn't slower"""
+    a, b = np.asarray(baseline, dtype=np.float64), np.asarray(candidate, dtype=np.float64)
+    na, nb = len(a), len(b)
+    if na == 0 or nb == 0:
+        return 1.0
+    values = np.concatenate([a, b])
+    n = na + nb
+    order = np.argsort(values, kind="stable")
+    ranks = np.empty(n)
+    ranks[order] = np.arange(1, n + 1)
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    ranks = (np.bincount(inverse, weights=ranks) / counts)[inverse] #ties share their average rank
+    u = ranks[na:].sum() - nb * (nb + 1) / 2
+    tie_correction = float(np.sum(counts**3 - counts)) / (n * (n - 1)) if n > 1 else 0
+    variance = na * nb / 12 * ((n + 1) - tie_correction)
+    if variance <= 0:
+        return 1.0
+    z = (u - na * nb / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+def compare(baseline:Dict, samples:Dict[str, List[float]], threshold:float = 0.1, alpha:float = 0.01)->List[Dict]:
+    """an entry per operation found in both. An operation regressed if its median grew by more than threshold
+    and the slowdown is significant at the alpha level"""
+    comparisons = []
+    for name, recorded in baseline["operations"].items():
+        if name not in samples:
+            continue
+        baseline_median = recorded["median_seconds"]
+        candidate_median = statistics.median(samples[name])
+        ratio = candidate_median / baseline_median if baseline_median > 0 else math.inf
+        p_value = slower_p_value(recorded["samples"], samples[name])
+        comparisons.append({
+            "operation": name,
+            "baseline_median_seconds": baseline_median,
+            "median_seconds": candidate_median,
+            "ratio": ratio,
+            "p_value": p_value,
+            "regressed": ratio > 1 + threshold and p_value < alpha,
+        })
+    return comparisons
+
+def format_comparisons(comparisons:List[Dict])->str:
+    lines = [f'{"operation":<30}{"baseline ms":>13}{"now ms":>10}{"ratio":>8}{"p":>9}']
+    for c in comparisons:
+        flag = "  SLOWER" if c["regressed"] else ""
+        lines.append(f'{c["operation"]:<30}{c["baseline_median_seconds"]*1000:>13.3f}{c["median_seconds"]*1000:>10.3f}{c["ratio"]:>8.2f}{c["p_value"]:>9.4f}{flag}')
+    return "\n".join(lines)
+
+def main(argv=None)->int:
+    parser = argparse.ArgumentParser(description="Record timing baselines and compare against them")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record_parser = commands.add_parser("record", help="measure and store a new baseline")
+    record_parser.add_argument("--output", default=DEFAULT_PATH)
+    record_parser.add_argument("--blobs", type=int, default=DEFAULT_CONFIGURATION["blobs"])
+    record_parser.add_argument("--link-length", type=float, default=DEFAULT_CONFIGURATION["link_length"])
+    record_parser.add_argument("--repeats", type=int, default=DEFAULT_CONFIGURATION["repeats"])
+    compare_parser = commands.add_parser("compare", help="measure again and flag significant slowdowns")
+    compare_parser.add_argument("--baseline", default=DEFAULT_PATH)
+    compare_parser.add_argument("--threshold", type=float, default=0.1, help="relative median slowdown that is tolerated")
+    compare_parser.add_argument("--alpha", type=float, default=0.01, help="significance level")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        configuration = {"blobs": args.blobs, "link_length": args.link_length, "repeats": args.repeats}
+        baseline = record(configuration)
+        with open(args.output, "w") as file:
+            json.dump(baseline, file, indent=1)
+        for name, recorded in baseline["operations"].items():
+            print(f'{name:<30}{recorded["median_seconds"]*1000:>10.3f} ms')
+        return 0
+
+    baseline = load(args.baseline)
+    comparisons = compare(baseline, measure(baseline["configuration"]), threshold=args.threshold, alpha=args.alpha)
+    print(format_comparisons(comparisons))
+    return 1 if any(c["regressed"] for c in comparisons) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
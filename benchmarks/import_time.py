@@ -0,0 +1,63 @@
+"""Times how long importing the core modules takes in a fresh interpreter, the start up cost of every worker process.
+It also reports whether the import dragged pygame in, which the geometry core should not do.
+python -m benchmarks.import_time [--modules point chain blob planar_graph] [--repeats 5]"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+CORE_MODULES = ["point", "chain", "blob", "planar_graph", "world", "simulation"]
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "pygame": sorted(m for m in sys.modules if m == "pygame" or m.startswith("pygame."))}}))
+"""
+
+
+def import_once(module:str)->Dict:
+    """seconds the import took in a new interpreter and the pygame modules it loaded"""
+    result = subprocess.run([sys.executable, "-c", _PROBE.format(module=module)],
+                            cwd=REPOSITORY, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def run(modules:List[str] = CORE_MODULES, repeats:int = 5)->List[Dict]:
+    records = []
+    for module in modules:
+        probes = [import_once(module) for _ in range(repeats)]
+        seconds = [probe["seconds"] for probe in probes]
+        records.append({
+            "module": module,
+            "median_seconds": statistics.median(seconds),
+            "seconds": seconds,
+            "pygame_modules": probes[-1]["pygame"],
+        })
+    return records
+
+def format_report(records:List[Dict])->str:
+    lines = [f'{"module":<16}{"median ms":>11}  pygame']
+    for r in records:
+        pygame_modules = len(r["pygame_modules"])
+        lines.append(f'{r["module"]:<16}{r["median_seconds"]*1000:>11.1f}  {f"{pygame_modules} modules" if pygame_modules else "not loaded"}')
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the import of the core modules in fresh interpreters")
+    parser.add_argument("--modules", nargs="+", default=CORE_MODULES)
+    parser.add_argument("--repeats", type=int, default=5, help="at least 1")
+    parser.add_argument("--output", default=None, help="machine readable results")
+    args = parser.parse_args(argv)
+    records = run(args.modules, args.repeats)
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(records, file, indent=1)
+    print(format_report(records))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Scaling benchmarks of the core geometry engine.
+Every operation is timed on worlds of increasing size, and the slope of log(time) over log(blob number)
+is reported per operation and resolution, so a path turning quadratic shows up as a steeper curve.
+python -m benchmarks.scaling [--sizes 10 100 1000 10000] [--resolutions 8 4] [--output results.json]"""
+import argparse
+import json
+import math
+import platform
+import statistics
+import time
+from typing import Callable, Dict, List
+import numpy as np
+import simulation
+import state
+from chain import Chain
+from benchmarks.worlds import create_grid_world, install_world
+
+QUICK_SIZES = [10, 100]
+FULL_SIZES = [10, 100, 1000, 10000]
+RESOLUTIONS = [8.0, 4.0] #link lengths, the smaller the more points per blob
+
+
+def time_calls(call:Callable[[int], None], repeats:int)->List[float]:
+    """seconds of every call(repeat_index)"""
+    seconds = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        call(i)
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+def benchmark_world(blob_number:int, link_length:float, repeats:int)->List[Dict]:
+    blobs = create_grid_world(blob_number, link_length, cell_size=2*state.min_thinkness)
+    chains = state.get_chains_list(blobs)
+    point_number = sum(chain.point_number - 1 for chain in chains)
+    index_berth = math.ceil(math.pi/2 * state.min_thinkness / link_length)
+
+    def calculate_areas(_):
+        for blob in blobs:
+            blob.calculate_area()
+
+    def find_minimum_widths(_):
+        for blob in blobs:
+            blob.find_local_minimum_width_pair_under_target_width(sample_number=3, index_berth=min(index_berth, blob.point_number//2 - 1), target_width=state.min_thinkness)
+
+    def get_chain_loops(_):
+        Chain.get_chain_loops_from_chains(chains)
+
+    def spawn(i):
+        blob = blobs[i % len(blobs)]
+        blob.spawn_small_blob(blob.point_number // 8)
+
+    records = []
+    def record(operation:str, seconds:List[float]):
+        records.append({
+            "operation": operation,
+            "blobs": blob_number,
+            "link_length": link_length,
+            "points": point_number,
+            "repeats": repeats,
+            "median_seconds": statistics.median(seconds),
+            "min_seconds": min(seconds),
+            "seconds": seconds,
+        })
+
+    record("calculate_area", time_calls(calculate_areas, repeats))
+    record("find_local_minimum_width", time_calls(find_minimum_widths, repeats))
+    record("get_chain_loops_from_chains", time_calls(get_chain_loops, repeats))
+    #the operations that change the world go last
+    world = install_world(blobs, link_length)
+    simulation.simulate(world, dt=0) #builds the cached indexes and batches outside of the timing
+    record("simulate", time_calls(lambda _: simulation.simulate(world, dt=0), repeats))
+    record("spawn_small_blob", time_calls(spawn, repeats))
+    return records
+
+def scaling_exponents(records:List[Dict])->Dict[str, Dict[str, float]]:
+    """slope of log(median time) over log(blob number) for every operation and link length, 1 means linear"""
+    exponents = dict()
+    keys = sorted({(r["operation"], r["link_length"]) for r in records})
+    for operation, link_length in keys:
+        series = sorted((r["blobs"], r["median_seconds"]) for r in records if r["operation"] == operation and r["link_length"] == link_length)
+        if len(series) < 2:
+            continue
+        sizes, seconds = np.array(series).T
+        slope, _ = np.polyfit(np.log(sizes), np.log(np.maximum(seconds, 1e-9)), 1)
+        exponents.setdefault(operation, dict())[str(link_length)] = float(slope)
+    return exponents
+
+def run(sizes:List[int], resolutions:List[float], repeats:int)->Dict:
+    records = []
+    for link_length in resolutions:
+        for blob_number in sizes:
+            records.extend(benchmark_world(blob_number, link_length, repeats))
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": records,
+        "scaling": scaling_exponents(records),
+    }
+
+def format_report(report:Dict)->str:
+    lines = [f'{"operation":<30}{"blobs":>7}{"link":>6}{"points":>9}{"median ms":>12}']
+    for r in report["results"]:
+        lines.append(f'{r["operation"]:<30}{r["blobs"]:>7}{r["link_length"]:>6}{r["points"]:>9}{r["median_seconds"]*1000:>12.3f}')
+    lines.append("scaling exponents (time ~ blobs^k):")
+    for operation, by_link_length in report["scaling"].items():
+        exponents = ", ".join(f"link {link_length}: {k:.2f}" for link_length, k in by_link_length.items())
+        lines.append(f"  {operation:<30}{exponents}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the core operations on worlds of increasing size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=QUICK_SIZES, help=f"blob numbers, the full suite is {FULL_SIZES}")
+    parser.add_argument("--full", action="store_true", help="use the full list of sizes")
+    parser.add_argument("--resolutions", type=float, nargs="+", default=RESOLUTIONS, help="link lengths")
+    parser.add_argument("--repeats", type=int, default=5, help="at least 1")
+    parser.add_argument("--output", default="benchmark_results.json", help="machine readable results")
+    args = parser.parse_args(argv)
+    report = run(FULL_SIZES if args.full else args.sizes, args.resolutions, args.repeats)
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=1)
+    print(format_report(report))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Worlds of a given size for benchmarking, built directly instead of grown by the simulation."""
+import math
+from blob import Blob
+from chain import Chain
+from point import Point
+from world import World
+
+
+def create_grid_world(blob_number:int, link_length:float, cell_size:float = 40, margin:float = 5)->list[Blob]:
+    """square blobs tiled in a grid, neighbors share their chains.
+    The chains on the border have a blob on one side only, they are made unmoving like the chains of the frame blob"""
+    columns = math.ceil(math.sqrt(blob_number))
+    rows = math.ceil(blob_number / columns)
+    points = [[Point(margin + c * cell_size, margin + r * cell_size) for c in range(columns + 1)] for r in range(rows + 1)]
+    horizontal = [[Chain.from_end_points(points[r][c], points[r][c+1], link_length=link_length) for c in range(columns)] for r in range(rows + 1)]
+    vertical = [[Chain.from_end_points(points[r][c], points[r+1][c], link_length=link_length) for c in range(columns + 1)] for r in range(rows)]
+    blobs = []
+    for i in range(blob_number):
+        r, c = divmod(i, columns)
+        blob = Blob.from_chain_loop([horizontal[r][c], vertical[r][c+1], horizontal[r+1][c], vertical[r][c]])
+        blob.link_length = link_length
+        blobs.append(blob)
+    for blob in blobs:
+        blob.set_blob_reference_on_chains()
+    for blob in blobs:
+        for chain in blob.chain_loop:
+            if (chain.blob_left is None) != (chain.blob_right is None):
+                chain.is_unmoving_override = True
+    return blobs
+
+def install_world(blobs:list[Blob], link_length:float, seed:int = 0)->World:
+    """a world of the blobs for simulation.simulate to step, the default world is left alone.
+    It is seeded, so every benchmark run spawns the same blobs"""
+    world = World(resolution=link_length, seed=seed)
+    world.blobs.extend(blobs)
+    return world
@@ -1,11 +1,35 @@
 import warnings
 from chain import Chain
+from half_edge import HalfEdgeGraph
 from point import Point
 
-from typing import List, Optional
+from typing import Iterator, List, Optional
 import math
 import random
+from bisect import bisect_left
+from itertools import islice
+import numpy as np
 from list_util import rotate_list
+from point_store import StoredPoint
+from spatial_grid import close_pairs
+
+
+class ChainLoop(list):
+    """A list of chains that counts its own modifications, so that a blob can tell when its cached indexes are stale
+    even if the loop is edited in place."""
+    version = 0
+
+def _counting_modifications(method_name:str):
+    list_method = getattr(list, method_name)
+    def method(self:ChainLoop, *args, **kwargs):
+        self.version += 1
+        return list_method(self, *args, **kwargs)
+    method.__name__ = method_name
+    return method
+
+for _method_name in ["__setitem__", "__delitem__", "__iadd__", "append", "extend", "insert", "pop", "remove", "reverse", "sort", "clear"]:
+    setattr(ChainLoop, _method_name, _counting_modifications(_method_name))
+
 
 class Blob:
     """Blob is a a data structure holding a chain loop. Each chain consists of points. So you can think of blobs as a point rings. Chains can be forward or backward depending on whether their inner order of points aligns with the blob's chain loop. Or you can think of blobs as a representaion of 2d bubbles, where chains are the shared edges between the bubbles."""
@@ -21,43 +45,107 @@ class Blob:
 
     
     #keep this ordered.
-    chain_loop:List[Chain]
+    @property
+    def chain_loop(self)->ChainLoop:
+        return self._chain_loop
+
+    @chain_loop.setter
+    def chain_loop(self, chains:List[Chain]):
+        previous_version = self._chain_loop.version if hasattr(self, "_chain_loop") else 0
+        self._chain_loop = ChainLoop(chains)
+        self._chain_loop.version = previous_version + 1
+
+    _topology_version = 0
+    _seen_chain_loop_version = -1
+    _chains_changed = False
+    @property
+    def topology_version(self)->int:
+        """changes whenever the chain loop or the points of one of its chains change.
+        Changes of chains of other blobs don't count, so an unchanged blob keeps its caches.
+        Checking it is O(1), the chains tell the blob when they change, see Chain.add_dependent_blob"""
+        chain_loop = self.chain_loop
+        if self._chains_changed or chain_loop.version != self._seen_chain_loop_version:
+            self._chains_changed = False
+            self._seen_chain_loop_version = chain_loop.version
+            self._topology_version += 1
+            for chain in chain_loop:
+                chain.add_dependent_blob(self)
+        return self._topology_version
+
+    def mark_topology_changed(self):
+        self.chain_loop.version += 1
+
+    def chain_topology_changed(self):
+        """called by a chain of the loop when its points change"""
+        self._chains_changed = True
+
+    _geometry_key:tuple = ()
+    _geometry_revision = 0
+    @property
+    def geometry_revision(self)->int:
+        """A counter that grows whenever a member point is moved by apply_accumulated_offsets or the topology changes.
+        Costs one version check per chain and doesn't look at the points."""
+        key = (self.topology_version, sum(chain.geometry_version for chain in self.chain_loop))
+        if key != self._geometry_key:
+            self._geometry_key = key
+            self._geometry_revision += 1
+        return self._geometry_revision
+
+    _geometry_cache_revision = -1
+    def _cached_geometry(self, name:str, calculate):
+        """returns the remembered result of calculate() unless the blob has changed its shape since"""
+        revision = self.geometry_revision
+        if self._geometry_cache_revision != revision:
+            self._geometry_cache = dict()
+            self._geometry_cache_revision = revision
+        if name not in self._geometry_cache:
+            self._geometry_cache[name] = calculate()
+        return self._geometry_cache[name]
+
+    _indexed_topology_version = -1
+    def _chain_offsets(self)->List[int]:
+        """prefix sums of on-blob point indexes where each chain starts, with the point number as the last item.
+        Rebuilt only when the topology version changes"""
+        if self._indexed_topology_version != self.topology_version:
+            offsets = [0]
+            for chain in self.chain_loop:
+                offsets.append(offsets[-1] + len(chain.points) - 1)
+            self._offsets = offsets
+            self._backwards_flags = [None] * len(self.chain_loop)
+            self._chain_indexes = {id(chain):i for i, chain in reversed(list(enumerate(self.chain_loop)))}
+            self._indexed_topology_version = self.topology_version
+        return self._offsets
+
+    def chain_index_of(self, chain:Chain)->int:
+        self._chain_offsets()
+        if id(chain) not in self._chain_indexes:
+            return self.chain_loop.index(chain) #an equivalent chain object
+        return self._chain_indexes[id(chain)]
+
+    def chain_index_at(self, point_index:int)->int:
+        """index of the chain holding the point, an intersection belongs to the chain that ends in it (except for 0)"""
+        offsets = self._chain_offsets()
+        return max(0, bisect_left(offsets, point_index) - 1)
 
     @property
     def intersection_indexes(self)->List[int]:
         """list of indexes of all intersections excluding the 0 one.
         This way the number of indexes is the same as the number of chains
         and each one corresponds to a single intersection."""
-        i = 0
-        indexes = []
-        for chain in self.chain_loop:
-            i+= len(chain.points) - 1
-            indexes.append(i)
-        return indexes
+        return self._chain_offsets()[1:]
 
     @property
     def point_number(self)->int:
-        i = 0
-        for chain in self.chain_loop:
-            i+= len(chain.points)
-
-        double_counted_endpoints_num = len(self.chain_loop)
-        i-= double_counted_endpoints_num
-        return i
+        return self._chain_offsets()[-1]
     
     is_unmoving_override = False
 
     def get_chain_and_on_chain_point_index_at(self, point_index)->tuple[Chain, int]:
         point_index %= self.point_number
-        intersections = [0] + self.intersection_indexes
-        #find chain index using the intersections
-        chain_index = 0
-        for i, intersection in enumerate(intersections):
-            if intersection >= point_index:
-                break
-            chain_index = i
-        low_end = intersections[chain_index]
-        high_end = intersections[chain_index+1]
+        offsets = self._chain_offsets()
+        chain_index = self.chain_index_at(point_index)
+        low_end = offsets[chain_index]
+        high_end = offsets[chain_index+1]
         if self.is_chain_backwards(chain_index):
             chain_point_i = high_end - point_index
         else:
@@ -69,7 +157,35 @@ class Blob:
         chain, on_chain_point_index = self.get_chain_and_on_chain_point_index_at(point_index)
         return chain.points[on_chain_point_index]
 
+    def iter_points(self)->Iterator[Point]:
+        """Walks the ring once, in the order of the on-blob indexes, without building intermediate lists.
+        Each point is yielded once, the endpoint shared by two consecutive chains comes with the chain that starts at it."""
+        for chain, is_backwards in zip(self.chain_loop, self.chain_directions()):
+            last = len(chain.points) - 1
+            if is_backwards:
+                yield from islice(reversed(chain.points), last)
+            else:
+                yield from islice(chain.points, last)
+
+    def coordinates_array(self, points:Optional[List[Point]] = None)->np.ndarray:
+        """(point_number, 2) array of the ring coordinates in on-blob index order.
+        It is a copy: writing into it does not move the points. Pass points_list if you already have it"""
+        points = self.points_list if points is None else points
+        if len(points) > 0 and isinstance(points[0], StoredPoint):
+            store = points[0].store
+            if all(isinstance(p, StoredPoint) and p.store is store for p in points):
+                return store.co[store.indexes_of(points)]
+        co = np.empty((len(points), 2), dtype=np.float64)
+        for i, point in enumerate(points):
+            c = point.co
+            co[i, 0] = c.x
+            co[i, 1] = c.y
+        return co
+
     def is_clockwise(self):
+        return self._cached_geometry("is_clockwise", self._calculate_is_clockwise)
+
+    def _calculate_is_clockwise(self):
         points = []
         if len(self.chain_loop) > 2:
 
@@ -94,11 +210,11 @@ class Blob:
         # Calculate the signed area using the Shoelace formula
         area = 0
         for i, p in enumerate(points):
-            np = points[(i + 1) % len(points)]
+            next_p = points[(i + 1) % len(points)]
             x1 = p.co.x
-            x2 =np.co.x
+            x2 =next_p.co.x
             y1 = p.co.y
-            y2 =np.co.y
+            y2 =next_p.co.y
             area += x1 * y2 - x2 * y1
         # If the signed area is positive, the points are in a clockwise order
         # its the oposite how it usually works because one axis (y) is flipped and the other isn't
@@ -113,13 +229,14 @@ class Blob:
         else:
             return v.rotate(-90)/2
         
-    def spawn_small_blob(self, spawn_location:int|None = None) -> tuple["Blob", List[Chain]]:
-        """Returns:
+    def spawn_small_blob(self, spawn_location:int|None = None, rng:random.Random|None = None) -> tuple["Blob", List[Chain]]:
+        """A random spawn location is drawn from rng, the global random module if it isn't given.
+        Returns:
             The new blob : Blob
             A list of chains to be updated : List[Chain]
             """
         if spawn_location == None:
-            spawn_location = random.randint(0, self.point_number)
+            spawn_location = (random if rng is None else rng).randint(0, self.point_number)
         #consider picking a random chain intersection instead of a random point. 
         spawn_location %= self.point_number
         inset = self.get_inner_direction(spawn_location)
@@ -136,6 +253,9 @@ class Blob:
             start_index = spawn_location-1, 
             end_index = spawn_location + 1
             )
+        half_edge_graph = on_old_blob_chains[0].half_edge_graph
+        if half_edge_graph is not None:
+            half_edge_graph.add_chain(new_chain)
         self.swap_chains(chains_to_remove = on_old_blob_chains, chains_to_insert=[new_chain])
         new_blob_chains = on_old_blob_chains + [new_chain]
         new_blob = Blob.from_chain_loop(new_blob_chains)
@@ -171,38 +291,32 @@ class Blob:
     
     def is_intersection_at(self, point_index):
         point_index %= self.point_number
-        point_count = 0
-        for chain in self.chain_loop:
-            if point_count == point_index:
-                return True
-            if point_count > point_index:
-                return False
-            point_count+= chain.point_number - 1
-        return False
+        offsets = self._chain_offsets()
+        i = bisect_left(offsets, point_index)
+        return offsets[i] == point_index
     
     def cut_at(self, point_index):
         if self.is_intersection_at(point_index):
             return self.get_chains_at_intersection(point_index)
         chain, on_chain_point_index = self.get_chain_and_on_chain_point_index_at(point_index)
-        chain_index = self.chain_loop.index(chain)
+        chain_index = self.chain_index_at(point_index % self.point_number)
         flip = self.is_chain_backwards(chain_index=chain_index)
         chain_start, chain_end = chain.cut(on_chain_point_index)
         if flip:
             chain_start, chain_end = chain_end, chain_start
         self.chain_loop[chain_index] = chain_end
         self.chain_loop.insert(chain_index, chain_start)
+        self.mark_topology_changed()
         return chain_start, chain_end
     
     def get_chains_indexes_at_intersection(self, point_index:int):
         point_index %= self.point_number
-        p_i = len(self.chain_loop) - 1
-        point_count = 0
-        for n_i, next_chain in enumerate(self.chain_loop):
-            if point_index == point_count:
-                return (p_i, n_i)
-            p_i = n_i
-            point_count+=next_chain.point_number - 1
-        raise ValueError("this place should not be reached at runtime")
+        offsets = self._chain_offsets()
+        n_i = bisect_left(offsets, point_index)
+        if offsets[n_i] != point_index:
+            raise ValueError("this place should not be reached at runtime")
+        p_i = n_i - 1 if n_i > 0 else len(self.chain_loop) - 1
+        return (p_i, n_i)
 
     def get_chains_at_intersection(self, point_index:int):
         p_i, n_i = self.get_chains_indexes_at_intersection(point_index)
@@ -211,33 +325,48 @@ class Blob:
         return previous_chain, next_chain
 
     def is_chain_backwards(self, chain:Chain= None, chain_index:int = None)->bool:
-        """if Chain is provided, the blob references are used to quickly determine the result.
-        but if we are changing/setting them, or can not trust them. Use the chain index."""
+        """Accepts either the chain or its index in the chain loop.
+        The result is cached together with the chain offsets until the topology changes."""
         if len(self.chain_loop) == 1:
                 return False #there is only one chain - of course it isn't backwards
         if isinstance(chain, int):
             chain_index = chain
             chain = None
         if chain_index == None:
-            chain_index = self.chain_loop.index(chain)
+            chain_index = self.chain_index_of(chain)
             return self.is_chain_backwards(chain_index = chain_index)
         if chain == None:
-            next_index = (chain_index + 1) % len(self.chain_loop)
-            chain = self.chain_loop[chain_index]
-            next_chain = self.chain_loop[next_index]
-            if len(self.chain_loop)>2:
-                common_point = chain.common_endpoint(next_chain)
-                is_backwards = chain.point_start == common_point
-                return is_backwards
-            if len(self.chain_loop) == 2:
-                #in a blob of two chains we will arbitrary decide that the first chain is in the right direction
-                if chain_index == 0:
-                    return False
-                if chain_index == 1:
-                    are_end_to_end = chain.point_end == next_chain.point_end
-                    is_second_chain_backward = are_end_to_end
-                    return is_second_chain_backward
-        raise RuntimeError("Shouldn't have reached this point, most likely an argument type error")    
+            self._chain_offsets()
+            if self._backwards_flags[chain_index] is None:
+                self._backwards_flags[chain_index] = self._is_chain_backwards_uncached(chain_index)
+            return self._backwards_flags[chain_index]
+        raise RuntimeError("Shouldn't have reached this point, most likely an argument type error")
+
+    def chain_directions(self)->List[bool]:
+        """is_chain_backwards of every chain of the loop, in one pass. Don't modify the list, it is the cache"""
+        self._chain_offsets()
+        flags = self._backwards_flags
+        if len(flags) == 1:
+            flags[0] = False
+        for chain_index, flag in enumerate(flags):
+            if flag is None:
+                flags[chain_index] = self._is_chain_backwards_uncached(chain_index)
+        return flags
+
+    def _is_chain_backwards_uncached(self, chain_index:int)->bool:
+        next_index = (chain_index + 1) % len(self.chain_loop)
+        chain = self.chain_loop[chain_index]
+        next_chain = self.chain_loop[next_index]
+        if len(self.chain_loop)>2:
+            common_point = chain.common_endpoint(next_chain)
+            is_backwards = chain.point_start == common_point
+            return is_backwards
+        #in a blob of two chains we will arbitrary decide that the first chain is in the right direction
+        if chain_index == 0:
+            return False
+        are_end_to_end = chain.point_end == next_chain.point_end
+        is_second_chain_backward = are_end_to_end
+        return is_second_chain_backward
         
  
     def swap_chains(self, chains_to_remove:List[Chain], chains_to_insert:List[Chain]):
@@ -261,6 +390,7 @@ class Blob:
         chlp = rotate_list(chlp, rotation_amount)
 
         self.chain_loop = chlp[:]
+        self.mark_topology_changed()
 
     def assert_loop_is_connected(self):
         if len(self.chain_loop) == 1:
@@ -299,36 +429,47 @@ class Blob:
         self.assert_loop_is_connected()
         
 
-    remembered_rough_centroid_xy:tuple[float, float] = (math.inf, math.inf)
     @property
     def area(self):
-        actual_rough_centroid = self.rough_centroid_xy
-        if self.remembered_rough_centroid_xy != actual_rough_centroid:
-            self.remembered_rough_centroid_xy = actual_rough_centroid
-            self.cashed_area = None
-        if self.cashed_area is None:
-            self.cashed_area = self.calculate_area()
-        return self.cashed_area
-    cashed_area: float
+        return abs(self.signed_area)
+
+    @property
+    def signed_area(self)->float:
+        """Assembled from the running shoelace sums of the chains, so after a frame it only costs the moved points.
+        calculate_area is the exact from-scratch version"""
+        return self._cached_geometry("signed_area", self._signed_area_from_chains)
+
+    def _signed_area_from_chains(self)->float:
+        doubled_area = 0
+        for chain, is_backwards in zip(self.chain_loop, self.chain_directions()):
+            if is_backwards:
+                doubled_area -= chain.shoelace_sum
+            else:
+                doubled_area += chain.shoelace_sum
+        return doubled_area/2
+
+    @property
+    def cashed_area(self)->float:
+        return self.area
     def calculate_area(self):
         area = 0 
-        for i in range(self.point_number):
-            next_i = (i + 1) % self.point_number
-            p1 = self.get_point(i)
-            p2 = self.get_point(next_i)
-            x1 = p1.co.x
-            x2 = p2.co.x
-            y1 = p1.co.y
-            y2 = p2.co.y
-            area += x1 * y2 - x2 * y1
+        first_co = previous_co = None
+        for point in self.iter_points():
+            co = point.co
+            if previous_co is None:
+                first_co = co
+            else:
+                area += previous_co.x * co.y - co.x * previous_co.y
+            previous_co = co
+        if previous_co is not None:
+            area += previous_co.x * first_co.y - first_co.x * previous_co.y
         area/=2
         return abs(area)
 
     def set_blob_reference_on_chains(self):
         cw = self.is_clockwise()
         blob_is_to_the_left = not cw
-        for i, chain in enumerate(self.chain_loop):
-            backwards = self.is_chain_backwards(i)
+        for chain, backwards in zip(self.chain_loop, self.chain_directions()):
             left = blob_is_to_the_left
             if backwards:
                 left = not blob_is_to_the_left
@@ -338,13 +479,21 @@ class Blob:
                 chain.set_blobs(right=self)
     
     def create_midpoint(self, point_index:int, next_index:int)->Point:
+        remembered_width_pairs = self._current_remembered_width_pairs()
+        point_number = self.point_number
         chain, chain_point_i, next_chain_point_i = self.get_chain_and_indexes_of_neighbors(point_index, next_index)
         new_point = chain.create_midpoint(chain_point_i, next_chain_point_i)
+        self.mark_topology_changed()
+        if remembered_width_pairs:
+            i, j = point_index % point_number, next_index % point_number
+            inserted_at = point_number if {i, j} == {0, point_number-1} else max(i, j)
+            shifted_pairs = [tuple(index + (index >= inserted_at) for index in pair) for pair in remembered_width_pairs]
+            self._remember_width_pairs(shifted_pairs, self._remembered_width)
         return new_point
     
     def get_chain_and_indexes_of_neighbors(self, point_i:int, next_i:int)->tuple[Chain, int, int]:
         chain_index = self.get_points_common_chain_index(point_i, next_i)
-        iis = [0] + self.intersection_indexes
+        iis = self._chain_offsets()
         low_i = iis[chain_index]
         high_i = iis[chain_index+1]
         if next_i == 0:
@@ -360,17 +509,10 @@ class Blob:
 
     def get_chains_indexes_at_point(self, point_index):
         point_index %= self.point_number
-        intersections = [0] + self.intersection_indexes
-        if point_index in intersections:
+        if self.is_intersection_at(point_index):
             chain1_i, chain2_i =  self.get_chains_indexes_at_intersection(point_index)
             return [chain1_i, chain2_i]
-        
-        chain_index = 0
-        for i, intersection in enumerate(intersections):
-            if intersection >= point_index:
-                break
-            chain_index = i
-        return [chain_index]
+        return [self.chain_index_at(point_index)]
     
     def get_chains_at_point(self, point_index):
         indexes = self.get_chains_indexes_at_point(point_index)
@@ -408,6 +550,21 @@ class Blob:
         return prev_index, next_index
         
     def remove_point(self, point_index):
+        remembered_width_pairs = self._current_remembered_width_pairs()
+        point_index %= self.point_number
+        removed_point = self._remove_point(point_index)
+        if remembered_width_pairs:
+            point_number = self.point_number
+            shifted_pairs = []
+            for pair in remembered_width_pairs:
+                a, b = [(index - (index > point_index)) % point_number for index in pair]
+                if a != b:
+                    shifted_pairs.append((a, b))
+            self._remember_width_pairs(shifted_pairs, self._remembered_width)
+        return removed_point
+
+    def _remove_point(self, point_index):
+        self.mark_topology_changed()
         if not self.is_intersection_at(point_index):
             chain, chain_point_index = self.get_chain_and_on_chain_point_index_at(point_index)
             return chain.remove_point(chain_point_index)
@@ -450,13 +607,12 @@ class Blob:
     
     def find_most_crowded_point_index(self):
         smallest_sum = math.inf
-        for point_index in range(self.point_number):
-            prev_index, next_index = self.neighboring_indexes(point_index)
-            prev_point = self.get_point(prev_index)
-            point = self.get_point(point_index)
-            next_point = self.get_point(next_index)
-            prev_gap = point.co.distance_squared_to(prev_point.co)
-            next_gap = point.co.distance_squared_to(next_point.co)
+        cos = [point.co for point in self.iter_points()]
+        for point_index, co in enumerate(cos):
+            prev_co = cos[point_index - 1]
+            next_co = cos[(point_index + 1) % len(cos)]
+            prev_gap = co.distance_squared_to(prev_co)
+            next_gap = co.distance_squared_to(next_co)
             index_sum = prev_gap + next_gap
             if index_sum < smallest_sum:
                 i = point_index
@@ -494,14 +650,24 @@ class Blob:
 
     @property
     def points_list(self)->list[Point]:
-        return [self.get_point(index) for index in range(self.point_number)]
+        return list(self.iter_points())
     
     @property
     def actual_circumference(self)->float:
+        return self._cached_geometry("actual_circumference", self.calculate_circumference)
+
+    def calculate_circumference(self)->float:
         s = 0
-        for i in range(self.point_number):
-            _, n = self.neighboring_indexes(i)
-            s += self.points_distance(i, n)
+        first_co = previous_co = None
+        for point in self.iter_points():
+            co = point.co
+            if previous_co is None:
+                first_co = co
+            else:
+                s += previous_co.distance_to(co)
+            previous_co = co
+        if previous_co is not None:
+            s += previous_co.distance_to(first_co)
         return s
     
     @property
@@ -515,6 +681,11 @@ class Blob:
     def link_length(self, length:float):
         self._stored_link_length = length
 
+    @property
+    def known_link_length(self)->Optional[float]:
+        """the link length the blob was given or has worked out, None if link_length would have to calculate it"""
+        return self._stored_link_length if self._stored_link_length != 0 else None
+
     def find_local_minimum_width_pair_under_target_width(self, sample_number:int, index_berth:int, target_width:float):
         """Will semi efficiently find the local minimum width and return the pair of indexes and the width.
         if the found width is larger than the target width, returns -1, -1 and a width that most likely isn't the smallest"""
@@ -528,24 +699,129 @@ class Blob:
             return pairs
 
         #----------main-----------
-        smallest_width_so_far = math.inf
-        initial_guesses = initial_pairs(number_of_pairs=sample_number)
-        closest_pair=(-3, -3)
-        for pair in initial_guesses:
-            found_local_minimum = False
-            closer_pair = pair
-            while not found_local_minimum:
-                closer_pair, distance = self.try_finding_closer_pair(closer_pair,index_berth=index_berth, target_distance=target_width)
-                found_local_minimum = closer_pair == (-404, -404) #a code meaning that we have reached the local minimum, the privious pair was the closest so we can get out of the loop
-                if distance<smallest_width_so_far:
-                    smallest_width_so_far = distance
-                    closest_pair = closer_pair
+        #warm start from the bottlenecks of the previous call, they rarely move far between frames
+        local_minimums = None
+        warm_start_pairs = self._current_remembered_width_pairs()
+        if warm_start_pairs:
+            local_minimums = self._descend_to_local_minimum_widths(warm_start_pairs, index_berth=index_berth, target_width=target_width)
+            _, warm_width = min(local_minimums, key=lambda minimum: minimum[1])
+            if warm_width > self._remembered_width + self.width_warm_start_tolerance * self.link_length:
+                local_minimums = None #drifted too far, the bottleneck may be elsewhere by now
+        if local_minimums is None:
+            initial_guesses = initial_pairs(number_of_pairs=sample_number)
+            local_minimums = self._descend_to_local_minimum_widths(initial_guesses, index_berth=index_berth, target_width=target_width)
+        if len(local_minimums) == 0:
+            return -1, -1, math.inf
+        closest_pair, smallest_width = min(local_minimums, key=lambda minimum: minimum[1])
+        self._remember_width_pairs([pair for pair, _ in local_minimums], smallest_width)
         index_a, index_b = closest_pair
-        smallest_width = smallest_width_so_far
         if smallest_width > target_width:
             return -1, -1, smallest_width
         return index_a, index_b, smallest_width
 
+    def _descend_to_local_minimum_widths(self, initial_pairs:List[tuple[int, int]], index_berth:int, target_width:float)->List[tuple[tuple[int, int], float]]:
+        """follows try_finding_closer_pair from every initial pair and returns the local minimum pairs it reached with their widths"""
+        local_minimums = []
+        for pair in initial_pairs:
+            while True:
+                closer_pair, distance = self.try_finding_closer_pair(pair, index_berth=index_berth, target_distance=target_width)
+                if closer_pair == (-404, -404): #a code meaning that the current pair is the local minimum
+                    local_minimums.append((pair, distance))
+                    break
+                pair = closer_pair
+        return local_minimums
+
+    width_warm_start_tolerance = 2.0 #in link lengths, how much wider a warm started result may be than the remembered one before a full search
+    _remembered_width_pairs:List[tuple[int, int]] = []
+    _remembered_width = math.inf
+    _remembered_width_topology_version = -1
+
+    def _remember_width_pairs(self, pairs:List[tuple[int, int]], width:float):
+        self._remembered_width_pairs = list(dict.fromkeys(tuple(sorted(pair)) for pair in pairs))
+        self._remembered_width = width
+        self._remembered_width_topology_version = self.topology_version
+
+    def _current_remembered_width_pairs(self)->List[tuple[int, int]]:
+        """the remembered bottleneck pairs, or nothing if the topology changed in a way their indexes weren't remapped for"""
+        if self._remembered_width_topology_version != self.topology_version:
+            return []
+        return self._remembered_width_pairs
+
+    def close_point_pairs(self, index_berth:int, max_distance:float, co:Optional[np.ndarray] = None)->tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """all pairs of on-blob indexes that are at most max_distance apart in space
+        but more than index_berth apart along the ring, with their distances. co is the coordinates_array if you already have it"""
+        co = self.coordinates_array() if co is None else co
+        a, b, distances = close_pairs(co, max_distance)
+        index_difference = b - a
+        ring_distance = np.minimum(index_difference, len(co) - index_difference)
+        across = ring_distance > index_berth
+        return a[across], b[across], distances[across]
+
+    def find_minimum_width_pair_under_target_width(self, index_berth:int, target_width:float):
+        """Exact counterpart of find_local_minimum_width_pair_under_target_width, in about O(n log n).
+        Returns the closest pair of indexes whose index_distance exceeds index_berth, and their distance.
+        If no such pair is closer than the target width, returns -1, -1 and math.inf"""
+        a, b, distances = self.close_point_pairs(index_berth=index_berth, max_distance=target_width)
+        if len(distances) == 0:
+            return -1, -1, math.inf
+        closest = int(np.argmin(distances))
+        return int(a[closest]), int(b[closest]), float(distances[closest])
+
+    def enforce_minimal_width(self, minimal_width:float, ignore_umoving_status=False, index_berth:Optional[int]=None):
+        """Pushes apart the points that are closer than minimal_width across the blob, all of them in one vectorized pass.
+        Every point repels its closest partner the same way Point.mutually_repel would.
+        Points within index_berth of each other along the ring are neighbors rather than a bottleneck,
+        by default that is the number of links on a half circle with minimal_width as its diameter"""
+        points = self.points_list #gathered once, for the grid query and for handing out the offsets
+        co = self.coordinates_array(points)
+        point_number = len(points)
+        if index_berth is None:
+            index_berth = math.ceil(math.pi/2 * minimal_width / self.link_length)
+        index_berth = min(index_berth, point_number//2 - 1) #the opposite points always count
+        a, b, distances = self.close_point_pairs(index_berth=index_berth, max_distance=minimal_width, co=co)
+        #the other close partners of a point are mostly neighbors of its closest one, repelling them all would overshoot
+        closest_distances = np.full(point_number, np.inf)
+        np.minimum.at(closest_distances, a, distances)
+        np.minimum.at(closest_distances, b, distances)
+        keep = (distances == closest_distances[a]) | (distances == closest_distances[b])
+        keep &= distances >= 0.01 #not enough information to repel
+        if ignore_umoving_status:
+            unmoving = np.zeros(point_number, dtype=bool)
+        else:
+            unmoving = self.unmoving_points_mask()
+        keep &= ~(unmoving[a] & unmoving[b])
+        a, b, distances = a[keep], b[keep], distances[keep]
+        if len(a) == 0:
+            return
+        a_unmoving, b_unmoving = unmoving[a], unmoving[b]
+        direction = (co[b] - co[a]) / distances[:, None]
+        #both points move half of the way, a point next to an unmoving one moves all of it
+        shortage = minimal_width - distances
+        correction = direction * np.where(a_unmoving | b_unmoving, shortage, shortage / 2)[:, None]
+        offsets = np.zeros((point_number, 2))
+        for indexes, sign, is_unmoving in [(a, -1, a_unmoving), (b, 1, b_unmoving)]:
+            moving = ~is_unmoving
+            for axis in range(2):
+                offsets[:, axis] += np.bincount(indexes[moving], weights=sign * correction[moving, axis], minlength=point_number)
+        for i in np.flatnonzero(np.any(offsets != 0, axis=1)):
+            x, y = offsets[i]
+            points[i].add_offset(float(x), float(y))
+
+    def unmoving_points_mask(self)->np.ndarray:
+        """per on-blob index, whether the point stays in place: it is unmoving itself or every chain of this blob holding it is"""
+        offsets = self._chain_offsets()
+        unmoving = np.zeros(offsets[-1], dtype=bool)
+        chains_unmoving = [chain.is_unmoving for chain in self.chain_loop]
+        for chain_index, chain_unmoving in enumerate(chains_unmoving):
+            if chain_unmoving:
+                unmoving[offsets[chain_index]+1:offsets[chain_index+1]] = True
+                if chains_unmoving[chain_index-1]:
+                    unmoving[offsets[chain_index]] = True
+        for i, point in enumerate(self.iter_points()):
+            if point.is_unmoving:
+                unmoving[i] = True
+        return unmoving
+
     def try_finding_closer_pair(self, initial_pair:tuple[int,int],index_berth:int, target_distance:float):
         """will search in the vacinity, but if the given pair looks like the closest pair seems to be the initial one, it will return the initial one"""
         #helper function
@@ -624,8 +900,12 @@ class Blob:
         return my_points == your_points
 
     @classmethod
-    def construct_blobs_from_chains(cls, chains:list[Chain]):
-        chain_loops = Chain.get_chain_loops_from_chains(chains)
+    def construct_blobs_from_chains(cls, chains:list[Chain], half_edge_graph:Optional[HalfEdgeGraph] = None):
+        """the faces are read from the half edge graph when the chains are kept in one, the planar graph of the chains is traversed otherwise"""
+        if half_edge_graph is not None:
+            chain_loops = half_edge_graph.chain_loops()
+        else:
+            chain_loops = Chain.get_chain_loops_from_chains(chains)
         blobs = [Blob.from_chain_loop(chain_loop) for chain_loop in chain_loops]
         return blobs
     
@@ -636,13 +916,12 @@ class Blob:
     @property
     def rough_centroid_xy(self):
         '''isn't accurate, but efficient and deterministic'''
-        points = self.points_list
         point_number = self.point_number
         representatives_number = math.ceil(math.log2(point_number))
         sum_x, sum_y = 0, 0
         for r in range(representatives_number):
             i = r * math.floor(point_number//representatives_number)
-            rp = points[i] #representative point
+            rp = self.get_point(i) #representative point
             sum_x+= rp.co.x
             sum_y+= rp.co.y
         sum_x/=representatives_number
@@ -661,7 +940,13 @@ class Blob:
     
     @property
     def true_centroid(self):
-        sum_x = sum(p.co.x for p in self.points_list)
-        sum_y = sum(p.co.y for p in self.points_list)
+        return self._cached_geometry("true_centroid", self.calculate_true_centroid)
+
+    def calculate_true_centroid(self):
+        sum_x, sum_y = 0, 0
+        for p in self.iter_points():
+            co = p.co
+            sum_x += co.x
+            sum_y += co.y
         x, y = sum_x/self.point_number, sum_y/self.point_number
         return (x, y)
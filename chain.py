@@ -1,17 +1,34 @@
 from planar_graph import get_faces_of_planar_graph
+from half_edge import HalfEdgeGraph
 from point import Point
 from typing import List, Optional, Sequence, Tuple
 import math
-import pygame
-from pygame.math import Vector2
+from vector import Vector2
 
 
+_UNCHANGED = object()
+
 class Chain:
     def __init__(self, color = None) -> None:
         self.points = []
         if color ==None:
             color = "white"
-        self.color = pygame.Color(color)
+        self.color = color
+
+    _color_spec = "white"
+    _resolved_color = None
+    @property
+    def color(self) -> "pygame.Color":
+        """resolved on first read, which only drawing does, so the geometry doesn't need pygame"""
+        if self._resolved_color is None:
+            import pygame
+            self._resolved_color = pygame.Color(self._color_spec)
+        return self._resolved_color
+
+    @color.setter
+    def color(self, color):
+        self._color_spec = color
+        self._resolved_color = None
     
     @property
     def point_start(self) -> "Point":
@@ -22,6 +39,7 @@ class Chain:
     @point_start.setter
     def point_start(self, point:"Point"):
         self.points[0] = point
+        self.mark_topology_changed()
 
     @property
     def point_end(self) -> "Point":
@@ -33,6 +51,7 @@ class Chain:
     @point_end.setter
     def point_end(self, point:"Point"):
         self.points[-1] = point
+        self.mark_topology_changed()
 
     @property
     def point_number(self) -> int:
@@ -40,11 +59,34 @@ class Chain:
 
     points:List["Point"]
 
+    topology_version = 0
+    def mark_topology_changed(self):
+        """has to be called by anything that changes which points the chain holds or their order"""
+        self.topology_version += 1
+        for point in self.points:
+            point.owner_chain = self
+        if self.half_edge_graph is not None:
+            self.half_edge_graph.chain_changed(self)
+        if self._dependent_blobs is not None:
+            for blob in self._dependent_blobs.values():
+                blob.chain_topology_changed()
+            self._dependent_blobs = None
+
+    half_edge_graph:Optional[HalfEdgeGraph] = None #keeps the faces around the chain up to date if set
+    _dependent_blobs:Optional[dict] = None #blobs whose indexes were built from the current points, told once when they change
+
+    def add_dependent_blob(self, blob):
+        """blob.chain_topology_changed() is called on the next mark_topology_changed, then the blob has to add itself again"""
+        if self._dependent_blobs is None:
+            self._dependent_blobs = dict()
+        self._dependent_blobs[id(blob)] = blob
+
 
     @classmethod
     def from_point_list(cls, points:Sequence["Point"], color = None) -> "Chain":
         chain = cls(color)
         chain.points = points[:] #list soft copy 
+        chain.mark_topology_changed()
         
         #connect point to it's neighbors
         for i, point in enumerate(chain.points):
@@ -74,7 +116,7 @@ class Chain:
         for i in range(1, point_num-1):
             t = i/(point_num-1)
             inter = start.co.lerp(end.co, t)
-            point = Point(inter.x, inter.y)
+            point = start.sibling(inter.x, inter.y)
             points.append(point)
         points.append(end)
         chain = cls.from_point_list(points, color)
@@ -83,8 +125,93 @@ class Chain:
     def apply_accumulated_offsets(self, ignore_unmoving_status = False):
         if not ignore_unmoving_status and self.is_unmoving:
                 return
+        track_shoelace = self._is_shoelace_sum_tracked()
+        moved = False
+        #inner points go first, so that the shoelace updates see the endpoints where they were recorded
+        for i in range(1, self.point_number - 1):
+            point = self.points[i]
+            dx, dy = point.offset.x, point.offset.y
+            if point._apply_offset(ignore_unmoving=ignore_unmoving_status):
+                moved = True
+                if track_shoelace:
+                    previous_co, next_co = self.points[i-1].co, self.points[i+1].co
+                    self._shoelace_sum += dx * (next_co.y - previous_co.y) + dy * (previous_co.x - next_co.x)
+        #_apply_offset doesn't tell the owner chain: this chain updates itself,
+        #and the other chains of an endpoint notice its new position when they compare their endpoints
+        for point in [self.point_start, self.point_end] if self.point_number > 1 else self.points:
+            if point._apply_offset(ignore_unmoving=ignore_unmoving_status):
+                moved = True
+        if moved:
+            self._geometry_version += 1
+            self._shoelace_updates += 1
+
+    _geometry_version = 0
+    _recorded_endpoints:tuple = ()
+    def mark_geometry_changed(self):
+        """has to be called by anything that moves points of the chain without apply_accumulated_offsets"""
+        self._geometry_version += 1
+        self._shoelace_topology_version = -1
+
+    shoelace_recompute_interval = 100 #incremental updates allowed before a full recompute bounds the floating point drift
+    _shoelace_sum = 0.0
+    _shoelace_topology_version = -1
+    _shoelace_updates = 0
+    _shoelace_endpoints:tuple = ()
+
+    def calculate_shoelace_sum(self)->float:
+        """sum of x1*y2 - x2*y1 over the links of the chain, in the chain's own direction.
+        A blob's doubled signed area is the sum of these over its chain loop, negated for backwards chains"""
+        s = 0
+        previous_co = None
         for point in self.points:
-            point.apply_accumulated_offset(ignore_unmoving=ignore_unmoving_status)
+            co = point.co
+            if previous_co is not None:
+                s += previous_co.x * co.y - co.x * previous_co.y
+            previous_co = co
+        return s
+
+    def _endpoints_coordinates(self)->tuple:
+        if self.point_number == 0:
+            return ()
+        start, end = self.point_start.co, self.point_end.co
+        return (start.x, start.y, end.x, end.y)
+
+    def _is_shoelace_sum_tracked(self)->bool:
+        """brings the running sum up to date with the endpoints. Returns False if it has to be recomputed anyway"""
+        if self._shoelace_topology_version != self.topology_version or self.point_number < 3:
+            return False
+        if self._shoelace_updates >= self.shoelace_recompute_interval:
+            return False
+        endpoints = self._endpoints_coordinates()
+        if endpoints != self._shoelace_endpoints:
+            #an endpoint was moved, most likely by another chain that shares it
+            sx, sy, ex, ey = self._shoelace_endpoints
+            new_sx, new_sy, new_ex, new_ey = endpoints
+            second, second_to_last = self.points[1].co, self.points[-2].co
+            self._shoelace_sum += (new_sx - sx) * second.y - second.x * (new_sy - sy)
+            self._shoelace_sum += second_to_last.x * (new_ey - ey) - (new_ex - ex) * second_to_last.y
+            self._shoelace_endpoints = endpoints
+        return True
+
+    @property
+    def shoelace_sum(self)->float:
+        """calculate_shoelace_sum kept up to date incrementally by apply_accumulated_offsets, at a cost proportional to the moved points"""
+        if not self._is_shoelace_sum_tracked():
+            self._shoelace_sum = self.calculate_shoelace_sum()
+            self._shoelace_endpoints = self._endpoints_coordinates()
+            self._shoelace_topology_version = self.topology_version
+            self._shoelace_updates = 0
+        return self._shoelace_sum
+
+    @property
+    def geometry_version(self)->int:
+        """Grows whenever points of the chain are moved by apply_accumulated_offsets.
+        Endpoints are shared with other chains which may have moved them, so they are compared to their last seen position."""
+        endpoints = self._endpoints_coordinates()
+        if endpoints != self._recorded_endpoints:
+            self._recorded_endpoints = endpoints
+            self._geometry_version += 1
+        return self._geometry_version
 
 
 
@@ -135,6 +262,7 @@ class Chain:
                 b.add_offset(-diff.x, -diff.y)
     
     def append_endpoint(self, point:Point, append_to_start:bool):
+        self.mark_topology_changed()
         if self.point_number == 0:
             self.points.append(point)
             return
@@ -176,15 +304,20 @@ class Chain:
     
     
     def cut(self, point_index:int|Point):
-        if type(point_index) is Point:
+        if isinstance(point_index, Point):
             point_index = self.points.index(point_index)
         if point_index <= 0 or point_index >= self.point_number - 1:
             raise ValueError("You are trying to cut too close to one of the ends of the chain. You are cutting at:", point_index, "While minimum is 1 and max is", self.point_number-2)
         start_points =  self.points[:point_index+1]
         end_points =    self.points[point_index:]
         self.points = start_points
+        self.mark_topology_changed()
         chain_start = self
-        chain_end = Chain.from_point_list(points=end_points, color=self.color)
+        chain_end = Chain.from_point_list(points=end_points, color=self._color_spec)
+        chain_end.set_blobs(left=self.blob_left, right=self.blob_right)
+        chain_end.is_unmoving_override = self.is_unmoving_override
+        if self.half_edge_graph is not None:
+            self.half_edge_graph.add_chain(chain_end)
         assert chain_start.is_connected_to(chain_end)        
         return chain_start, chain_end
     
@@ -224,13 +357,21 @@ class Chain:
         if not ignore_umoving_status and self.is_unmoving:
                 return
         
-        for i, p in enumerate(self.points):
-            if (p == self.point_start or p == self.point_end):
+        points = self.points
+        last = len(points) - 1
+        point_start, point_end = self.point_start, self.point_end
+        for i, p in enumerate(points):
+            if (p == point_start or p == point_end):
                 if p.is_unmoving and not ignore_umoving_status:
                     continue
-            n = self.right_normal_at(i)
-            n.scale_to_length(offset_magnitude)
-            p.add_offset(n.x, n.y)    
+            #right_normal_at(i) scaled to offset_magnitude, without the intermediate vectors
+            co1, co2 = points[max(0, i-1)].co, points[min(i+1, last)].co
+            nx, ny = co1.y - co2.y, co2.x - co1.x
+            length = math.hypot(nx, ny)
+            if length == 0:
+                raise ValueError("Cannot scale a vector with zero length")
+            scale = offset_magnitude / length
+            p.add_offset(nx * scale, ny * scale)
     
     def get_on_blob_point_index(self, blob, chain_point_index):
         is_flipped = blob.is_chain_backwards(self)
@@ -254,11 +395,12 @@ class Chain:
         point = self.points[point_index]
         next_point = self.points[next_index]
         mid_co = (point.co + next_point.co)/2
-        midpoint = Point(mid_co.x, mid_co.y)
+        midpoint = point.sibling(mid_co.x, mid_co.y)
         mid_offset = (point.offset + next_point.offset)/2
         midpoint.offset = mid_offset
         midpoint.insert_between(point, next_point)
         self.points.insert(point_index+1, midpoint)
+        self.mark_topology_changed()
         return midpoint
     
     def remove_point(self, point:int|Point):
@@ -280,18 +422,21 @@ class Chain:
             next_point = self.points[point_index+1]
             point.disconnect_point(next_point)
         self.points.remove(point) 
+        self.mark_topology_changed()
         return point
     
     def swap_point(self, point_to_remove:Point, point_to_insert:Point):
         point_index = self.points.index(point_to_remove)
         point_to_insert.swap_connections_with(point_to_remove)
         self.points[point_index] = point_to_insert
+        self.mark_topology_changed()
     
     
     
     def close(self):
         if self.point_start != self.point_end:
             self.points.append(self.point_start)
+            self.mark_topology_changed()
     
     is_unmoving_override:Optional[bool] = None
 
@@ -338,13 +483,32 @@ class Chain:
 
         other.unregister()
         self.points = new_point_list
+        self.mark_topology_changed()
         if br or bl:
             assert self.blob_right != self.blob_left
             
     def unregister(self):
         """removes the mutual references with both points and blobs"""
         self.points.clear()
+        self.mark_topology_changed()
         self.unregister_from_blobs()
+
+    blob_left:Optional["Blob"] = None
+    blob_right:Optional["Blob"] = None
+
+    def set_blobs(self, left = _UNCHANGED, right = _UNCHANGED):
+        """sets the blobs on either side of the chain, when looking from its start to its end. An omitted side is kept"""
+        if left is not _UNCHANGED:
+            self.blob_left = left
+        if right is not _UNCHANGED:
+            self.blob_right = right
+
+    def swap_blob_references(self):
+        """has to follow reversing the points, so that the blobs stay on the same side of the chain in space"""
+        self.blob_left, self.blob_right = self.blob_right, self.blob_left
+
+    def unregister_from_blobs(self):
+        self.set_blobs(None, None)
     
     name:Optional[str] = None
 
@@ -415,9 +579,10 @@ class Chain:
         return faces
 
     @staticmethod  
-    def create_translation_dictionaries(chains:list["Chain"])-> tuple[dict[str:list[Point]],dict[str,"Chain"]]:
+    def create_translation_dictionaries(chains:list["Chain"])-> tuple[dict[int,list[Point]],dict[tuple[int, int],"Chain"]]:
         # problem: when two chains share both endpoints, they are represented by the same value
         # solution: for every chain we will try to create two edges using a midpoint as a fake midpoint between them
+        # edges are keyed by the ids of their points, so points with the same coordinates never collide
         edge_to_chain = dict()
         chain_to_points = dict()         
         for chain in chains:
@@ -432,12 +597,12 @@ class Chain:
             edges = list(zip(point_representation, point_representation[1:]))
             for edge in edges:
                 a, b = edge
-                edge_to_chain[str((a, b))] = chain
-                edge_to_chain[str((b, a))] = chain
+                edge_to_chain[id(a), id(b)] = chain
+                edge_to_chain[id(b), id(a)] = chain
         return chain_to_points, edge_to_chain
   
     @staticmethod
-    def _construct_graph_representation(chain_to_points:dict[str:list[Point]])-> list[tuple[Point, Point]]:
+    def _construct_graph_representation(chain_to_points:dict[int,list[Point]])-> list[tuple[Point, Point]]:
         edges = []
         for points in chain_to_points.values():
             for i in range(len(points) -1):
@@ -445,14 +610,14 @@ class Chain:
         return edges
     
     @staticmethod
-    def translate_point_loops_to_chain_loops(point_loop_list:list[list[Point]], edge_to_chain:dict[str,"Chain"])->list[list["Chain"]]:
+    def translate_point_loops_to_chain_loops(point_loop_list:list[list[Point]], edge_to_chain:dict[tuple[int, int],"Chain"])->list[list["Chain"]]:
         chain_loops_list = []
         for point_loop in point_loop_list:
             assert point_loop[0] != point_loop[-1]
             chain_loop = []
             for i, a in enumerate(point_loop):
                 b = point_loop[i-1] if i!=0 else point_loop[-1]
-                chain = edge_to_chain[str((a,b))]
+                chain = edge_to_chain[id(a), id(b)]
                 if len(chain_loop) == 0:
                     already_added = False
                 else:
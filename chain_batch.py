@@ -0,0 +1,155 @@
+from typing import Iterable, List, Optional
+import math
+import numpy as np
+from chain import Chain
+from point import Point
+from point_store import StoredPoint
+
+
+class ChainBatch:
+    """Flat view of a group of chains: every distinct point gets a local index and
+    every link becomes an index pair, so per-chain constraints can be evaluated
+    for all chains at once with NumPy. Offsets are accumulated exactly like the per-chain methods do.
+    The index pairs only depend on topology, so a batch can be reused every frame until one of its chains changes."""
+    def __init__(self, chains:Iterable[Chain]) -> None:
+        self.chains:List[Chain] = list(chains)
+        self.signature = ChainBatch.signature_of(self.chains)
+        self._hop_pairs_cache = dict()
+        self.points:List[Point] = []
+        local_indexes = dict()
+        chain_points_indexes = []
+        for chain in self.chains:
+            indexes = []
+            for point in chain.points:
+                index = local_indexes.get(id(point))
+                if index is None:
+                    index = len(self.points)
+                    local_indexes[id(point)] = index
+                    self.points.append(point)
+                indexes.append(index)
+            chain_points_indexes.append(indexes)
+        self.chain_points_indexes = chain_points_indexes
+
+        starts, ends, link_chains = [], [], []
+        for chain_i, indexes in enumerate(chain_points_indexes):
+            starts.extend(indexes[:-1])
+            ends.extend(indexes[1:])
+            link_chains.extend([chain_i] * max(0, len(indexes) - 1))
+        self.link_starts = np.array(starts, dtype=np.intp)
+        self.link_ends = np.array(ends, dtype=np.intp)
+        self.link_chains = np.array(link_chains, dtype=np.intp)
+
+        self.store = None
+        self.store_indexes = None
+        stores = {id(p.store): p.store for p in self.points if isinstance(p, StoredPoint)}
+        all_stored = all(isinstance(p, StoredPoint) for p in self.points)
+        if all_stored and len(stores) == 1:
+            self.store, = stores.values()
+            self.store_indexes = self.store.indexes_of(self.points)
+
+    @staticmethod
+    def signature_of(chains:Iterable[Chain]) -> tuple:
+        return tuple((id(chain), chain.topology_version) for chain in chains)
+
+    def is_valid_for(self, chains:Iterable[Chain]) -> bool:
+        """True if the batch was built from these exact chains and none of them changed its points since"""
+        return self.signature == ChainBatch.signature_of(chains)
+
+    @classmethod
+    def reuse_or_build(cls, batch:Optional["ChainBatch"], chains:Iterable[Chain]) -> "ChainBatch":
+        chains = list(chains)
+        if batch is not None and batch.is_valid_for(chains):
+            return batch
+        return cls(chains)
+
+    @property
+    def point_number(self) -> int:
+        return len(self.points)
+
+    def hop_pairs(self, hop_num:int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(i, i+hop_num) local index pairs of every chain, and the chain each pair belongs to"""
+        if hop_num not in self._hop_pairs_cache:
+            starts, ends, pair_chains = [], [], []
+            for chain_i, indexes in enumerate(self.chain_points_indexes):
+                pair_number = len(indexes) - hop_num
+                if pair_number <= 0:
+                    continue
+                starts.extend(indexes[:pair_number])
+                ends.extend(indexes[hop_num:])
+                pair_chains.extend([chain_i] * pair_number)
+            self._hop_pairs_cache[hop_num] = (
+                np.array(starts, dtype=np.intp),
+                np.array(ends, dtype=np.intp),
+                np.array(pair_chains, dtype=np.intp),
+            )
+        return self._hop_pairs_cache[hop_num]
+
+    def movable_chains_mask(self) -> np.ndarray:
+        return np.fromiter((not chain.is_unmoving for chain in self.chains), dtype=bool, count=len(self.chains))
+
+    def gather_coordinates(self) -> np.ndarray:
+        if self.store is not None:
+            return self.store.co[self.store_indexes]
+        co = np.empty((self.point_number, 2), dtype=np.float64)
+        for i, point in enumerate(self.points):
+            c = point.co
+            co[i, 0] = c.x
+            co[i, 1] = c.y
+        return co
+
+    def scatter_offsets(self, offsets:np.ndarray):
+        """adds the (point_number, 2) array of offsets to the accumulated offsets of the points"""
+        if self.store is not None:
+            self.store.offset[self.store_indexes] += offsets
+            return
+        for i in np.flatnonzero(np.any(offsets != 0, axis=1)):
+            x, y = offsets[i]
+            self.points[i].add_offset(float(x), float(y))
+
+    def _accumulate(self, indexes:np.ndarray, values:np.ndarray) -> np.ndarray:
+        offsets = np.empty((self.point_number, 2), dtype=np.float64)
+        offsets[:, 0] = np.bincount(indexes, weights=values[:, 0], minlength=self.point_number)
+        offsets[:, 1] = np.bincount(indexes, weights=values[:, 1], minlength=self.point_number)
+        return offsets
+
+    def _active_links(self, link_chains:np.ndarray, ignore_umoving_status:bool) -> np.ndarray:
+        if ignore_umoving_status:
+            return np.ones(len(link_chains), dtype=bool)
+        return self.movable_chains_mask()[link_chains]
+
+    def enforce_link_length(self, link_length:float, ignore_umoving_status = False):
+        """batched Chain.enforce_link_length over every chain of the batch"""
+        active = self._active_links(self.link_chains, ignore_umoving_status)
+        a, b = self.link_starts[active], self.link_ends[active]
+        if len(a) == 0:
+            return
+        co = self.gather_coordinates()
+        correction = co[b] - co[a]
+        length = np.hypot(correction[:, 0], correction[:, 1])
+        #links shorter than 0.01 are pushed by their raw difference, same as the per chain method
+        scale = np.ones_like(length)
+        long_enough = length > 0.01
+        scale[long_enough] = (length[long_enough] - link_length) / 2 / length[long_enough]
+        correction *= scale[:, None]
+        offsets = self._accumulate(np.concatenate([a, b]), np.concatenate([correction, -correction]))
+        self.scatter_offsets(offsets)
+
+    def enforce_minimum_secondary_joint_distance(self, distance:float, link_length:float):
+        """batched Chain.enforce_minimum_secondary_joint_distance over every movable chain of the batch"""
+        hop_num = math.ceil(distance/link_length)
+        a, b, pair_chains = self.hop_pairs(hop_num)
+        active = self._active_links(pair_chains, ignore_umoving_status=False)
+        a, b = a[active], b[active]
+        if len(a) == 0:
+            return
+        co = self.gather_coordinates()
+        diff = co[b] - co[a]
+        length_squared = np.einsum("ij,ij->i", diff, diff)
+        too_close = (length_squared < distance*distance) & (length_squared > 0)
+        a, b, diff = a[too_close], b[too_close], diff[too_close]
+        if len(a) == 0:
+            return
+        length = np.sqrt(length_squared[too_close])
+        correction = diff * ((length - distance) / 4 / length)[:, None]
+        offsets = self._accumulate(np.concatenate([a, b]), np.concatenate([correction, -correction]))
+        self.scatter_offsets(offsets)
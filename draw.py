@@ -1,9 +1,10 @@
 import pygame.draw as pd
 from point import Point
-from state import chains
 from blob import Blob
 from chain import Chain
 import state
+import simulation
+from world import World
 import pygame
 
 screen = pygame.display.get_surface()
@@ -18,15 +19,29 @@ def highlight_point(point:Point):
 
 # font = pygame.font.Font(size=15)#todo: get a valid font name
 
-def draw_state():
+def draw_state(world:World = None):
+    world = simulation.default_world if world is None else world
     screen.lock()
     screen.fill(0)
-    pygame.display.set_caption(state.frame_count.__str__())
-    for chain in chains:
+    pygame.display.set_caption(world.frame_count.__str__())
+    for chain in world.chains:
         draw_chain(chain)
-    if state.point_of_interest is not None:
-        highlight_point(point=state.point_of_interest)
+    if world.point_of_interest is not None:
+        highlight_point(point=world.point_of_interest)
     screen.unlock()
+    if state.show_phase_timings:
+        draw_text_lines(world.timer.overlay_lines())
+
+overlay_font:pygame.font.Font = None
+def draw_text_lines(lines:list[str], color = "gray", top_left = (5, 5)):
+    global overlay_font
+    if overlay_font is None:
+        overlay_font = pygame.font.SysFont("monospace", 12)
+    x, y = top_left
+    for line in lines:
+        text = overlay_font.render(line, True, color)
+        screen.blit(text, (x, y))
+        y += text.get_height()
 
 def draw_blob(blob:Blob):
     for chain in blob.chain_loop:
@@ -0,0 +1,61 @@
+from typing import Callable
+
+
+class FixedTimestep:
+    """Decouples the simulation cadence from the frame rate.
+    Real time is accumulated, and the simulation is stepped once per step_seconds of it (split into substeps),
+    no matter how long the frames take. After a long stall at most max_catch_up_steps are run,
+    the rest of the backlog is dropped so that a slow frame can't snowball into ever slower ones.
+    While the simulation is behind, rendering can be skipped, but never more than max_skipped_renders frames in a row."""
+    def __init__(self, step_seconds:float = 1/60, substeps:int = 1, max_catch_up_steps:int = 5, max_skipped_renders:int = 5) -> None:
+        if step_seconds <= 0:
+            raise ValueError("The step has to take some time", step_seconds)
+        if substeps < 1 or max_catch_up_steps < 1:
+            raise ValueError("At least one substep and one catch up step are needed", substeps, max_catch_up_steps)
+        self.step_seconds = step_seconds
+        self.substeps = substeps
+        self.max_catch_up_steps = max_catch_up_steps
+        self.max_skipped_renders = max_skipped_renders
+
+    accumulated_seconds = 0.0
+    steps = 0 #simulated steps so far, each made of substeps calls
+    dropped_steps = 0 #steps given up because of the catch up cap
+    skipped_renders = 0 #in a row
+    is_behind = False
+
+    @property
+    def substep_seconds(self)->float:
+        return self.step_seconds / self.substeps
+
+    def steps_due(self, elapsed_seconds:float)->int:
+        """adds the elapsed real time and returns how many whole steps it pays for"""
+        self.accumulated_seconds += max(0.0, elapsed_seconds)
+        due = int(self.accumulated_seconds // self.step_seconds)
+        self.is_behind = due > 1
+        if due > self.max_catch_up_steps:
+            self.dropped_steps += due - self.max_catch_up_steps
+            self.accumulated_seconds -= (due - self.max_catch_up_steps) * self.step_seconds
+            due = self.max_catch_up_steps
+        self.accumulated_seconds -= due * self.step_seconds
+        return due
+
+    def advance(self, elapsed_seconds:float, step:Callable[[float], None])->int:
+        """calls step(dt) for every substep that the elapsed time is due, returns the number of whole steps"""
+        due = self.steps_due(elapsed_seconds)
+        dt = self.substep_seconds
+        for _ in range(due * self.substeps):
+            step(dt)
+        self.steps += due
+        return due
+
+    def should_render(self)->bool:
+        if self.is_behind and self.skipped_renders < self.max_skipped_renders:
+            self.skipped_renders += 1
+            return False
+        self.skipped_renders = 0
+        return True
+
+    @property
+    def interpolation(self)->float:
+        """how far the real time got between the last step and the next one, from 0 to 1"""
+        return self.accumulated_seconds / self.step_seconds
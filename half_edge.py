@@ -0,0 +1,201 @@
+"""A half edge graph over the chain endpoints that answers face queries without a full planar traversal.
+The simulation itself never asks it for faces, spawning and cutting know the chain loops they change.
+World keeps one up to date (setup, spawning, cutting and snapshot loading register the chains) for outside callers,
+e.g. Blob.construct_blobs_from_chains or analysis of a running world. Keeping it costs a dict insert per chain change."""
+from typing import Dict, Iterable, List, Optional
+from point import Point
+from planar_graph import compute_angle
+
+
+class HalfEdge:
+    """One direction of a chain, from origin to the other endpoint.
+    next is the half edge that follows it along the boundary of the face on its left, as in planar_graph.face_traversal"""
+    def __init__(self, chain, forward:bool) -> None:
+        self.chain = chain
+        self.forward = forward
+        self.origin:Point = chain.point_start if forward else chain.point_end
+
+    twin:"HalfEdge"
+    next:Optional["HalfEdge"] = None
+    sorted_direction_point:Optional[Point] = None #the direction point the origin was last sorted by
+
+    @property
+    def target(self)->Point:
+        return self.twin.origin
+
+    @property
+    def direction_point(self)->Point:
+        """the first point after the origin, it decides the angular order at the origin"""
+        return self.chain.points[1] if self.forward else self.chain.points[-2]
+
+    def __repr__(self) -> str:
+        return f"<HalfEdge of {self.chain} {'forwards' if self.forward else 'backwards'}>"
+
+
+class HalfEdgeGraph:
+    """Persistent half edge (DCEL) structure over chain endpoints.
+    Every chain is an edge between its endpoints. Chains report their changes through mark_topology_changed
+    and only the vertices they touch are relinked, so the faces never have to be recomputed from scratch.
+    The points move between queries, so a face walk sorts every vertex of three or more chains it passes again
+    if its coordinates changed since it was sorted. The order of fewer chains doesn't depend on the angles."""
+    def __init__(self) -> None:
+        self._half_edges:Dict[int, tuple[HalfEdge, HalfEdge]] = dict()
+        self._outgoing:Dict[int, List[HalfEdge]] = dict()
+        self._changed_chains:Dict[int, object] = dict()
+        self._sorted_coordinates:Dict[int, tuple] = dict() #of the junctions, when they were last sorted
+
+    @classmethod
+    def from_chains(cls, chains:Iterable) -> "HalfEdgeGraph":
+        graph = cls()
+        for chain in chains:
+            graph.add_chain(chain)
+        return graph
+
+    @property
+    def chains(self)->list:
+        self._update()
+        return [forward.chain for forward, _ in self._half_edges.values()]
+
+    def add_chain(self, chain):
+        chain.half_edge_graph = self
+        self._changed_chains[id(chain)] = chain
+
+    def remove_chain(self, chain):
+        self._changed_chains.pop(id(chain), None)
+        self._relink(self._unlink(chain))
+        if chain.half_edge_graph is self:
+            chain.half_edge_graph = None
+
+    def chain_changed(self, chain):
+        """called by the chain whenever its points change, the update is deferred until the next query"""
+        if chain.point_number < 2 and id(chain) not in self._half_edges:
+            #emptied before it was ever linked, e.g. merged away between two queries
+            self._changed_chains.pop(id(chain), None)
+            chain.half_edge_graph = None
+            return
+        self._changed_chains[id(chain)] = chain
+
+    def _update(self):
+        if self._changed_chains:
+            self._relink(self._apply_chain_changes())
+
+    def _apply_chain_changes(self)->Dict[int, Point]:
+        touched_vertices = dict()
+        changed_chains, self._changed_chains = self._changed_chains, dict()
+        for chain in changed_chains.values():
+            half_edges = self._half_edges.get(id(chain))
+            if half_edges is not None:
+                forward, backward = half_edges
+                if forward.origin is chain.point_start and backward.origin is chain.point_end and chain.point_number >= 2:
+                    #same endpoints, but a point inserted or removed next to one of them changes the order around it
+                    for half_edge in half_edges:
+                        if half_edge.sorted_direction_point is not half_edge.direction_point:
+                            touched_vertices[id(half_edge.origin)] = half_edge.origin
+                    continue
+                touched_vertices.update(self._unlink(chain))
+            if chain.point_number < 2:
+                chain.half_edge_graph = None
+                continue
+            forward, backward = HalfEdge(chain, forward=True), HalfEdge(chain, forward=False)
+            forward.twin, backward.twin = backward, forward
+            self._half_edges[id(chain)] = (forward, backward)
+            for half_edge in (forward, backward):
+                self._outgoing.setdefault(id(half_edge.origin), []).append(half_edge)
+                touched_vertices[id(half_edge.origin)] = half_edge.origin
+        return touched_vertices
+
+    def _unlink(self, chain)->Dict[int, Point]:
+        half_edges = self._half_edges.pop(id(chain), None)
+        if half_edges is None:
+            return dict()
+        touched_vertices = dict()
+        for half_edge in half_edges:
+            outgoing = self._outgoing[id(half_edge.origin)]
+            outgoing.remove(half_edge)
+            if len(outgoing) == 0:
+                del self._outgoing[id(half_edge.origin)]
+                self._sorted_coordinates.pop(id(half_edge.origin), None)
+            touched_vertices[id(half_edge.origin)] = half_edge.origin
+        return touched_vertices
+
+    def _relink(self, vertices:Dict[int, Point]):
+        """sorts the half edges leaving each vertex counter-clockwise, and makes every arriving half edge
+        continue with the one after its twin"""
+        for vertex_id, vertex in vertices.items():
+            outgoing = self._outgoing.get(vertex_id)
+            if outgoing is None:
+                continue
+            outgoing.sort(key=lambda half_edge: compute_angle(vertex.co, half_edge.direction_point.co))
+            for i, half_edge in enumerate(outgoing):
+                half_edge.twin.next = outgoing[(i + 1) % len(outgoing)]
+                half_edge.sorted_direction_point = half_edge.direction_point
+            if len(outgoing) > 2:
+                self._sorted_coordinates[vertex_id] = self._coordinates_around(vertex, outgoing)
+            else:
+                self._sorted_coordinates.pop(vertex_id, None)
+
+    @staticmethod
+    def _coordinates_around(vertex:Point, outgoing:List[HalfEdge])->tuple:
+        return (vertex.co.x, vertex.co.y, *(c for half_edge in outgoing for c in (half_edge.direction_point.co.x, half_edge.direction_point.co.y)))
+
+    def _resort_if_moved(self, vertex:Point):
+        coordinates = self._sorted_coordinates.get(id(vertex))
+        if coordinates is not None and coordinates != self._coordinates_around(vertex, self._outgoing[id(vertex)]):
+            self._relink({id(vertex): vertex})
+
+    def half_edge_of(self, chain, forward:bool = True)->HalfEdge:
+        self._update()
+        forward_half_edge, backward_half_edge = self._half_edges[id(chain)]
+        return forward_half_edge if forward else backward_half_edge
+
+    def face_of(self, half_edge:HalfEdge)->List[HalfEdge]:
+        """the boundary of the face on the left of the half edge, in O(face size) once the chain changes are applied"""
+        self._update()
+        return self._walk_face(half_edge)
+
+    def _walk_face(self, half_edge:HalfEdge)->List[HalfEdge]:
+        #the next half edge is decided at the target, so its order is checked before following it
+        face = [half_edge]
+        self._resort_if_moved(half_edge.target)
+        current = half_edge.next
+        while current is not half_edge:
+            face.append(current)
+            self._resort_if_moved(current.target)
+            current = current.next
+        return face
+
+    @staticmethod
+    def doubled_signed_area(face:List[HalfEdge])->float:
+        return sum(h.chain.shoelace_sum if h.forward else -h.chain.shoelace_sum for h in face)
+
+    @staticmethod
+    def chain_loop_of(face:List[HalfEdge])->list:
+        chain_loop = []
+        for half_edge in face:
+            if len(chain_loop) > 0 and (half_edge.chain is chain_loop[-1] or half_edge.chain is chain_loop[0]):
+                continue
+            chain_loop.append(half_edge.chain)
+        return chain_loop
+
+    def chain_loop_at(self, chain, forward:bool = True)->list:
+        """chain loop of the face on one side of the chain, without touching the rest of the graph"""
+        return self.chain_loop_of(self.face_of(self.half_edge_of(chain, forward)))
+
+    def faces(self, epsilon = 1e-9)->List[List[HalfEdge]]:
+        """all the inner faces (clockwise, same as planar_graph.get_faces_of_planar_graph)"""
+        self._update()
+        visited = set()
+        faces = []
+        for half_edges in self._half_edges.values():
+            for half_edge in half_edges:
+                if id(half_edge) in visited:
+                    continue
+                face = self._walk_face(half_edge)
+                visited.update(id(h) for h in face)
+                if self.doubled_signed_area(face) < -2 * epsilon:
+                    faces.append(face)
+        return faces
+
+    def chain_loops(self)->list[list]:
+        """same faces as Chain.get_chain_loops_from_chains"""
+        return [self.chain_loop_of(face) for face in self.faces()]
@@ -0,0 +1,97 @@
+"""Runs the simulation without ever opening a display, as fast as the machine allows.
+python headless.py --frames 1000 [--tolerance 0.01] [--timings timings.jsonl] [--trajectory run.trj --every 10]"""
+import argparse
+import time
+from typing import Optional
+import numpy as np
+import simulation
+from chain import Chain
+from trajectory import TrajectoryRecorder
+from world import World
+
+
+def topology_key(world:World)->tuple:
+    """changes whenever the topology of the world changes, other worlds stepped in the same process don't touch it"""
+    return tuple((id(blob), blob.topology_version) for blob in world.blobs)
+
+def points_coordinates(chains:list[Chain])->np.ndarray:
+    return np.array([(point.co.x, point.co.y) for chain in chains for point in chain.points], dtype=np.float64).reshape(-1, 2)
+
+def largest_displacement(previous:np.ndarray, current:np.ndarray)->float:
+    if previous.shape != current.shape:
+        return np.inf #the points were rearranged, it can't have settled
+    if len(current) == 0:
+        return 0
+    return float(np.max(np.hypot(*(current - previous).T)))
+
+def run(frames:int, tolerance:Optional[float] = None, world:Optional[World] = None, recorder:Optional[TrajectoryRecorder] = None)->dict:
+    """builds a fresh world and steps it for the given number of frames,
+    or until all its blobs are spawned and no point moves further than tolerance in a frame without the topology changing.
+    A new World with the default parameters is used unless one is given. The recorder gets every frame"""
+    world = World() if world is None else world
+    simulation.reset(world)
+    simulation.setup(world)
+    converged = False
+    frame = 0
+    previous = None
+    start = time.perf_counter()
+    while frame < frames:
+        topology_before = topology_key(world)
+        simulation.simulate(world, dt=0)
+        frame += 1
+        if recorder is not None:
+            recorder.record(world)
+        if tolerance is None:
+            continue
+        current = points_coordinates(world.chains)
+        still_spawning = len(world.blobs) < world.goal_blobs_num #nothing moves while it waits for the next spawn
+        if previous is not None and not still_spawning and topology_key(world) == topology_before and largest_displacement(previous, current) <= tolerance:
+            converged = True
+            break
+        previous = current
+    seconds = time.perf_counter() - start
+    return {
+        "frames": frame,
+        "seconds": seconds,
+        "fps": frame / seconds if seconds > 0 else float("inf"),
+        "converged": converged,
+        "blobs": len(world.blobs),
+        "phase_times": world.timer.totals(),
+        "world": world,
+    }
+
+def format_report(report:dict)->str:
+    lines = [
+        f'{report["frames"]} frames in {report["seconds"]:.3f}s, {report["fps"]:.1f} fps, {report["blobs"]} blobs'
+        + (", converged" if report["converged"] else ""),
+    ]
+    total = sum(report["phase_times"].values())
+    for name, seconds in sorted(report["phase_times"].items(), key=lambda item: -item[1]):
+        if seconds == 0:
+            continue #registered but never timed, e.g. joint sliding which only simulation_step does
+        share = seconds / total if total > 0 else 0
+        lines.append(f'  {name:<20}{seconds*1000/max(1, report["frames"]):9.3f} ms/frame {share:7.1%}')
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the simulation without a display")
+    parser.add_argument("--frames", type=int, default=1000, help="upper limit of simulated frames")
+    parser.add_argument("--tolerance", type=float, default=None, help="stop early once no point moves further than this in a frame")
+    parser.add_argument("--seed", type=int, default=0, help="of the random choices, the same seed replays the same run")
+    parser.add_argument("--timings", default=None, help="JSON lines file for the phase timings of the last buffered frames")
+    parser.add_argument("--trajectory", default=None, help="memory-mapped file for the point coordinates of the frames, see trajectory.py")
+    parser.add_argument("--every", type=int, default=1, help="record every n-th frame into the trajectory")
+    args = parser.parse_args(argv)
+    recorder = None if args.trajectory is None else TrajectoryRecorder(args.trajectory, every=args.every)
+    try:
+        report = run(args.frames, args.tolerance, world=World(seed=args.seed), recorder=recorder)
+    finally:
+        if recorder is not None:
+            recorder.close()
+    print(format_report(report))
+    if args.timings is not None:
+        with open(args.timings, "w") as file:
+            report["world"].timer.dump_json_lines(file)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import json
+import time
+from typing import Dict, Iterable, List, Optional, TextIO
+import numpy as np
+
+
+class PhaseTimer:
+    """Times the phases of every frame into a ring buffer that keeps the last `capacity` frames.
+    Wrap a phase in `with timer.phase(name):` and call end_frame once the frame is over.
+    A phase can be entered several times in a frame, the times add up."""
+    def __init__(self, phases:Iterable[str], capacity:int = 600) -> None:
+        self.phases:List[str] = list(phases)
+        self._columns = {name:i for i, name in enumerate(self.phases)}
+        self.capacity = max(1, capacity)
+        self.seconds = np.zeros((self.capacity, len(self.phases)))
+        self.frame_numbers = np.zeros(self.capacity, dtype=np.int64)
+        self._current = [0.0] * len(self.phases)
+        self._totals = [0.0] * len(self.phases)
+        self.frame_count = 0 #frames ended so far, the buffer holds the last min(frame_count, capacity) of them
+
+    def phase(self, name:str)->"_PhaseContext":
+        return _PhaseContext(self, self._columns[name])
+
+    def end_frame(self, frame_number:Optional[int] = None):
+        row = self.frame_count % self.capacity
+        self.seconds[row] = self._current
+        self.frame_numbers[row] = self.frame_count if frame_number is None else frame_number
+        for i, seconds in enumerate(self._current):
+            self._totals[i] += seconds
+            self._current[i] = 0.0
+        self.frame_count += 1
+
+    def reset(self):
+        self.seconds[:] = 0
+        self.frame_numbers[:] = 0
+        self._current = [0.0] * len(self.phases)
+        self._totals = [0.0] * len(self.phases)
+        self.frame_count = 0
+
+    def recent(self, last_frames:Optional[int] = None)->tuple[np.ndarray, np.ndarray]:
+        """frame numbers and a (frames, phases) array of seconds of the last frames, oldest first"""
+        stored = min(self.frame_count, self.capacity)
+        if last_frames is not None:
+            stored = min(stored, last_frames)
+        rows = np.arange(self.frame_count - stored, self.frame_count) % self.capacity
+        return self.frame_numbers[rows], self.seconds[rows]
+
+    def last(self)->Dict[str, float]:
+        _, seconds = self.recent(1)
+        if len(seconds) == 0:
+            return {name:0.0 for name in self.phases}
+        return dict(zip(self.phases, seconds[0].tolist()))
+
+    def means(self, last_frames:Optional[int] = None)->Dict[str, float]:
+        """mean seconds per frame of every phase over the buffered frames"""
+        _, seconds = self.recent(last_frames)
+        if len(seconds) == 0:
+            return {name:0.0 for name in self.phases}
+        return dict(zip(self.phases, seconds.mean(axis=0).tolist()))
+
+    def totals(self)->Dict[str, float]:
+        """seconds spent in every phase since the last reset, including the frames that fell out of the buffer"""
+        return dict(zip(self.phases, self._totals))
+
+    def dump_json_lines(self, file:TextIO, last_frames:Optional[int] = None):
+        """writes one JSON object per buffered frame: {"frame": n, "phases": {name: seconds}, "total": seconds}"""
+        frame_numbers, seconds = self.recent(last_frames)
+        for frame, row in zip(frame_numbers.tolist(), seconds.tolist()):
+            record = {"frame": frame, "phases": dict(zip(self.phases, row)), "total": sum(row)}
+            file.write(json.dumps(record) + "\n")
+
+    def overlay_lines(self, last_frames:int = 60)->List[str]:
+        """short text lines for an on-screen overlay, the mean of the last frames in milliseconds.
+        Phases that weren't entered in those frames are left out"""
+        means = self.means(last_frames)
+        lines = [f"{name:<20}{seconds*1000:7.2f} ms" for name, seconds in means.items() if seconds > 0]
+        lines.append(f"{'total':<20}{sum(means.values())*1000:7.2f} ms")
+        return lines
+
+
+class _PhaseContext:
+    """a plain context manager, cheaper than contextlib.contextmanager in hot loops"""
+    def __init__(self, timer:PhaseTimer, column:int) -> None:
+        self.timer = timer
+        self.column = column
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timer._current[self.column] += time.perf_counter() - self.start
+        return False
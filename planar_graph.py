@@ -1,6 +1,8 @@
+import math
+import numpy as np
 from point import Point
 
- 
+
 
 
 
@@ -12,121 +14,145 @@ def get_faces_of_planar_graph(edges:list[tuple[Point, Point]])->list[list[Point]
         assert B == b
         face = [A, B]
         faces = [face]
-        return faces    
-    
-    points = dict()
-    adjacency = dict()
-    for A, B in edges:
-        assert type(A) == Point
-        points[id(A)] = A
-        points[id(B)] = B
-    for i in points:
-        adjacency[i] = []
+        return faces
 
+    points = []
+    vertex_indexes = dict()
     for A, B in edges:
-        a,b = id(A), id(B)
-        adjacency[a].append(b)
-        adjacency[b].append(a)
-    
-    faces = face_traversal(points, adjacency)
-    return faces
+        assert isinstance(A, Point)
+        for P in (A, B):
+            if id(P) not in vertex_indexes:
+                vertex_indexes[id(P)] = len(points)
+                points.append(P)
 
-import math
+    coordinates = np.array([(P.co.x, P.co.y) for P in points], dtype=np.float64).reshape(-1, 2)
+    sources, targets = create_half_edges(edges, vertex_indexes)
+    faces = face_traversal(coordinates, sources, targets)
+    return [[points[v] for v in face] for face in faces]
 
-def face_traversal(points, adj):
+
+def create_half_edges(edges, vertex_indexes):
     """
-    Finds all the inner faces of a connected planar graph.
+    Splits every undirected edge into two half edges, 2k going from A to B and 2k+1 back,
+    so the twin of half edge h is always h ^ 1.
 
     Parameters:
-    - points: dict mapping id(Point) to Point instance.
-    - adj: dict mapping id(Point) to list of ids of adjacent Points.
+    - edges: list of (Point, Point) pairs.
+    - vertex_indexes: dict mapping id(Point) to its vertex index.
 
     Returns:
-    - faces: list of faces, each face is a list of Point instances.
+    - sources, targets: integer arrays with the vertex indexes of every half edge.
     """
-    epsilon = 1e-9  # Tolerance for floating-point comparisons
-
-    # Initialize the used dictionary to keep track of traversed edges
-    used = initialize_used(adj)
+    half_edge_number = 2 * len(edges)
+    sources = np.empty(half_edge_number, dtype=np.intp)
+    targets = np.empty(half_edge_number, dtype=np.intp)
+    sources[0::2] = targets[1::2] = [vertex_indexes[id(A)] for A, _ in edges]
+    targets[0::2] = sources[1::2] = [vertex_indexes[id(B)] for _, B in edges]
+    return sources, targets
 
-    # Sort adjacency lists counter-clockwise for each vertex
-    sort_all_adjacency_lists(points, adj)
 
-    faces = []  # List to store the inner faces
-
-    # Main traversal algorithm
-    for u in adj.keys():
-        for i in range(len(adj[u])):
-            if used[u][i]:
-                continue  # Edge already used in this direction
-
-            # Trace out a face starting from edge (u, adj[u][i])
-            face_vertices = trace_face(u, i, adj, used)
-
-            # Convert vertex ids to Point instances
-            face_points = [points[vid] for vid in face_vertices]
-
-            # Determine if the face is an inner face based on its orientation
-            if is_inner_face(face_points, epsilon):
-                faces.append(face_points)
-
-    return faces
+def face_traversal(coordinates, sources, targets):
+    """
+    Finds all the inner faces of a connected planar graph, in O(E) after sorting.
 
+    Parameters:
+    - coordinates: (V, 2) array of vertex coordinates.
+    - sources, targets: vertex indexes of the half edges, where half edge h ^ 1 is the twin of h.
 
-def initialize_used(adj):
+    Returns:
+    - faces: list of faces, each face is a list of vertex indexes.
     """
-    Initializes the 'used' dictionary to keep track of traversed edges.
+    epsilon = 1e-9  # Tolerance for floating-point comparisons
+
+    twins = np.arange(len(sources)) ^ 1
+    next_half_edges = link_half_edges(coordinates, sources, targets, twins)
+
+    # Label every half edge with the face it bounds
+    face_of_half_edge = [-1] * len(sources)
+    next_list = next_half_edges.tolist()
+    sources_list = sources.tolist()
+    last_face_of_vertex = [-1] * len(coordinates)
+    faces = []
+    for h_start in range(len(sources)):
+        if face_of_half_edge[h_start] != -1:
+            continue  # Edge already used in this direction
+        face_index = len(faces)
+        face = []
+        h = h_start
+        while face_of_half_edge[h] == -1:
+            face_of_half_edge[h] = face_index
+            u = sources_list[h]
+            assert last_face_of_vertex[u] != face_index
+            last_face_of_vertex[u] = face_index
+            face.append(u)
+            h = next_list[h]
+        faces.append(face)
+
+    # Inner faces are the clockwise ones
+    doubled_areas = compute_doubled_signed_areas(coordinates, sources, targets, np.array(face_of_half_edge, dtype=np.intp), len(faces))
+    return [face for face, doubled_area in zip(faces, doubled_areas) if doubled_area < -2 * epsilon]
+
+
+def link_half_edges(coordinates, sources, targets, twins):
+    """
+    For every half edge (u, v) finds the half edge that follows it around its face:
+    the one after (v, u) in the counter-clockwise order of the half edges leaving v.
 
     Parameters:
-    - adj: dict mapping vertex ids to lists of adjacent vertex ids.
+    - coordinates: (V, 2) array of vertex coordinates.
+    - sources, targets: vertex indexes of the half edges.
+    - twins: index of the reverse half edge of every half edge.
 
     Returns:
-    - used: dict mapping vertex ids to lists of booleans indicating edge usage.
+    - next_half_edges: integer array of the following half edge of every half edge.
     """
-    used = {}
-    for u in adj.keys():
-        used[u] = [False] * len(adj[u])
-    return used
+    # CSR adjacency: the half edges leaving vertex u are order[row_starts[u]:row_starts[u+1]]
+    order = sort_all_adjacency_lists(coordinates, sources, targets)
+    degrees = np.bincount(sources, minlength=len(coordinates))
+    row_starts = np.concatenate(([0], np.cumsum(degrees)))
+    ranks = np.empty_like(order)
+    ranks[order] = np.arange(len(order))
+
+    twin_ranks = ranks[twins]
+    next_ranks = twin_ranks + 1
+    v = targets
+    wrapped = next_ranks == row_starts[v + 1]
+    next_ranks[wrapped] = row_starts[v][wrapped]
+    return order[next_ranks]
 
 
-def sort_all_adjacency_lists(points, adj):
+def sort_all_adjacency_lists(coordinates, sources, targets):
     """
-    Sorts the adjacency lists of all vertices in counter-clockwise order.
+    Sorts the half edges by their source vertex, and counter-clockwise around it, with a single lexsort.
 
     Parameters:
-    - points: dict mapping vertex ids to Point instances.
-    - adj: dict mapping vertex ids to lists of adjacent vertex ids.
+    - coordinates: (V, 2) array of vertex coordinates.
+    - sources, targets: vertex indexes of the half edges.
+
+    Returns:
+    - order: half edge indexes, grouped by source vertex and sorted counter-clockwise within a group.
     """
-    for u in adj.keys():
-        adj[u] = sort_adjacency_list(u, points, adj)
+    directions = coordinates[targets] - coordinates[sources]
+    angles = pseudo_angles(directions[:, 0], directions[:, 1])
+    return np.lexsort((angles, sources))
 
 
-def sort_adjacency_list(u, points, adj):
+def pseudo_angles(dx, dy):
     """
-    Sorts the adjacency list of a single vertex in counter-clockwise order.
+    A cheap substitute for the angles of the directions (dx, dy) relative to the positive x-axis.
+    It grows monotonically with the angle, so it sorts directions the same way compute_angle does.
 
     Parameters:
-    - u: id of the vertex whose adjacency list is to be sorted.
-    - points: dict mapping vertex ids to Point instances.
-    - adj: dict mapping vertex ids to lists of adjacent vertex ids.
+    - dx, dy: arrays of direction components.
 
     Returns:
-    - sorted_adj_list: list of adjacent vertex ids sorted counter-clockwise.
+    - array of pseudo angles in the range [0, 4).
     """
-    p_u = points[u].co  # Coordinates of vertex u
-    adj_list = adj[u]   # List of adjacent vertex ids
-
-    # Compute the angle for each adjacent vertex
-    adj_angle_list = []
-    for v in adj_list:
-        angle = compute_angle(p_u, points[v].co)
-        adj_angle_list.append((angle, v))
-
-    # Sort the adjacency list by angle
-    adj_angle_list.sort()
-    sorted_adj_list = [v for (angle, v) in adj_angle_list]
-
-    return sorted_adj_list
+    lengths = np.abs(dx) + np.abs(dy)
+    p = np.divide(dx, lengths, out=np.zeros_like(lengths, dtype=np.float64), where=lengths > 0)
+    angles = np.where(dy < 0, 3 + p, 1 - p)
+    angles[lengths == 0] = 0  # same as atan2(0, 0)
+    return angles
 
 
 def compute_angle(p_u, p_v):
@@ -147,95 +173,19 @@ def compute_angle(p_u, p_v):
     return angle
 
 
-def trace_face(u_start, i_start, adj, used):
-    """
-    Traces out a face starting from a given edge.
-
-    Parameters:
-    - u_start: Starting vertex id.
-    - i_start: Index of the starting edge in adj[u_start].
-    - points: dict mapping vertex ids to Point instances.
-    - adj: dict mapping vertex ids to lists of adjacent vertex ids.
-    - used: dict tracking which edges have been traversed.
-
-    Returns:
-    - face_vertices: List of vertex ids forming the face.
-    """
-    face = []
-    u = u_start
-    i = i_start
-
-    while True:
-        used[u][i] = True
-        assert u not in face
-        face.append(u)
-
-        v = adj[u][i]
-        idx_v_u = find_adjacent_index(v, u, adj)
-
-        # Move to the next edge counter-clockwise around v
-        i = (idx_v_u + 1) % len(adj[v])
-
-        if v == u_start and i == i_start:
-            break  # Completed a face
-
-        u = v
-
-    return face
-
-
-def find_adjacent_index(u, v, adj):
-    """
-    Finds the index of vertex v in u's adjacency list.
-
-    Parameters:
-    - u: Vertex id whose adjacency list is searched.
-    - v: Vertex id to find in u's adjacency list.
-    - adj: dict mapping vertex ids to lists of adjacent vertex ids.
-
-    Returns:
-    - idx: Index of v in adj[u].
-
-    Raises:
-    - Exception: If v is not found in adj[u].
-    """
-    try:
-        idx = adj[u].index(v)
-    except ValueError:
-        raise ValueError(f"Graph is not properly connected: vertex {v} not found in adj[{u}].")
-    return idx
-
-
-def is_inner_face(face_points, epsilon):
-    """
-    Determines if a face is an inner face based on its orientation.
-
-    Parameters:
-    - face_points: List of Point instances forming the face.
-    - epsilon: Small number for floating-point tolerance.
-
-    Returns:
-    - inner: True if the face is an inner face (clockwise orientation), False otherwise.
-    """
-    area = compute_signed_area(face_points)
-    return area < -epsilon
-
-
-def compute_signed_area(face_points):
+def compute_doubled_signed_areas(coordinates, sources, targets, face_of_half_edge, face_number):
     """
-    Computes the signed area of a polygon defined by face_points.
+    Computes twice the signed area of every face at once, with the shoelace formula.
 
     Parameters:
-    - face_points: List of Point instances forming the polygon.
+    - coordinates: (V, 2) array of vertex coordinates.
+    - sources, targets: vertex indexes of the half edges.
+    - face_of_half_edge: index of the face each half edge bounds.
+    - face_number: number of faces.
 
     Returns:
-    - area: Signed area of the polygon.
+    - doubled_areas: array of twice the signed area of every face.
     """
-    area = 0.0
-    n = len(face_points)
-    for j in range(n):
-        xi, yi = face_points[j].co.x, face_points[j].co.y
-        xj, yj = face_points[(j + 1) % n].co.x, face_points[(j + 1) % n].co.y
-        area += xi * yj - xj * yi
-    area /= 2.0
-    return area
\ No newline at end of file
+    a, b = coordinates[sources], coordinates[targets]
+    cross = a[:, 0] * b[:, 1] - b[:, 0] * a[:, 1]
+    return np.bincount(face_of_half_edge, weights=cross, minlength=face_number)
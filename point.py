@@ -1,5 +1,6 @@
+import math
 from typing import Optional
-from pygame.math import Vector2
+from vector import Vector2
 
 def connect_point_list(points:list["Point"]):
     for i, point in enumerate(points):
@@ -17,11 +18,27 @@ class Point:
         self.offset.x += x * multiplier
         self.offset.y += y * multiplier
     
-    def apply_accumulated_offset(self, ignore_unmoving = False):
+    def apply_accumulated_offset(self, ignore_unmoving = False)->bool:
+        """returns whether the point has actually moved. The chain holding the point is told, so its cached geometry is refreshed"""
+        moved = self._apply_offset(ignore_unmoving)
+        if moved and self.owner_chain is not None:
+            self.owner_chain.mark_geometry_changed()
+        return moved
+
+    owner_chain = None #the last chain that took the point in, see Chain.mark_topology_changed
+    
+    def _apply_offset(self, ignore_unmoving = False)->bool:
+        """apply_accumulated_offset without telling the owner chain, for the chain itself"""
         if (not ignore_unmoving) and self.is_unmoving:
-            return
-        self.co+=self.offset
-        self.offset.update(0,0)
+            return False
+        offset = self.offset
+        if offset.x == 0 and offset.y == 0:
+            return False
+        co = self.co
+        co.x += offset.x
+        co.y += offset.y
+        offset.x = offset.y = 0.0
+        return True
 
     def __str__(self) -> str:
         return f'Point at {self.co}'
@@ -31,11 +48,19 @@ class Point:
     @classmethod
     def from_point_and_offset(cls, point:"Point", offset:Vector2):
         co = point.co + offset
-        return cls(co.x, co.y)
+        return point.sibling(co.x, co.y)
+
+    def sibling(self, x:float, y:float) -> "Point":
+        """creates a new point backed by the same kind of storage as this one"""
+        return Point(x, y)
     
     def clamp_offset(self, clamp_value):
-        if self.offset.length_squared() > clamp_value*clamp_value:
-            self.offset.scale_to_length(clamp_value)
+        offset = self.offset
+        length_squared = offset.x*offset.x + offset.y*offset.y
+        if length_squared > clamp_value*clamp_value:
+            factor = clamp_value / math.sqrt(length_squared)
+            offset.x *= factor
+            offset.y *= factor
     
     @property
     def is_unmoving(self):
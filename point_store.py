@@ -0,0 +1,171 @@
+from typing import Iterable, Optional
+import numpy as np
+from vector import Vector2
+from point import Point
+
+
+class PointStore:
+    """Struct-of-arrays storage for point coordinates and offsets.
+    Row i of `co` and `offset` belongs to the StoredPoint whose index is i.
+    The arrays are reallocated when the store grows, so vectorized passes should
+    read `store.co`/`store.offset` again after creating points instead of keeping old references."""
+    def __init__(self, capacity:int = 1024) -> None:
+        capacity = max(1, capacity)
+        self.co = np.zeros((capacity, 2), dtype=np.float64)
+        self.offset = np.zeros((capacity, 2), dtype=np.float64)
+        self.in_use = np.zeros(capacity, dtype=bool)
+        self.size = 0 #high water mark, rows past it were never handed out
+        self._handles:list[Optional["StoredPoint"]] = [] #the point of every row, to tell their chains when apply_offsets moves them
+        self._free_indexes:list[int] = []
+
+    @property
+    def capacity(self) -> int:
+        return len(self.co)
+
+    @property
+    def point_number(self) -> int:
+        return self.size - len(self._free_indexes)
+
+    def allocate(self, x:float, y:float, point:Optional["StoredPoint"] = None) -> int:
+        if self._free_indexes:
+            index = self._free_indexes.pop()
+        else:
+            if self.size == self.capacity:
+                self._grow()
+            index = self.size
+            self.size += 1
+            self._handles.append(None)
+        self._handles[index] = point
+        self.co[index] = (x, y)
+        self.offset[index] = (0, 0)
+        self.in_use[index] = True
+        return index
+
+    def release(self, index:int):
+        """marks the row as free so that a future point can reuse it. The point that owned it must not be used afterwards"""
+        if not self.in_use[index]:
+            raise ValueError("Trying to release a row that is not in use", index)
+        self.in_use[index] = False
+        self._handles[index] = None
+        self._free_indexes.append(index)
+
+    def _grow(self):
+        new_capacity = self.capacity * 2
+        for name in ["co", "offset", "in_use"]:
+            old = getattr(self, name)
+            new = np.zeros((new_capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def create_point(self, x:float, y:float) -> "StoredPoint":
+        return StoredPoint(x, y, self)
+
+    def adopt(self, points:Iterable[Point]):
+        """moves already existing points into the store, turning them into StoredPoint handles in place.
+        Connections and every reference held by chains stay valid."""
+        for point in points:
+            if isinstance(point, StoredPoint):
+                if point.store is not self:
+                    raise ValueError("Point already belongs to a different store", point)
+                continue
+            co, offset = point.co, point.offset
+            del point.co, point.offset #free the Vector2 objects
+            point.__class__ = StoredPoint
+            point.store = self
+            point.index = self.allocate(co.x, co.y, point)
+            point.offset = offset
+
+    def indexes_of(self, points:Iterable["StoredPoint"]) -> np.ndarray:
+        return np.fromiter((p.index for p in points), dtype=np.intp)
+
+    def apply_offsets(self, indexes:Optional[np.ndarray] = None):
+        """vectorized equivalent of calling apply_accumulated_offset(ignore_unmoving=True) on the given points (or on every point),
+        the chains of the moved points are told just the same"""
+        if indexes is None:
+            indexes = np.flatnonzero(self.in_use[:self.size])
+        indexes = np.asarray(indexes)
+        moved = indexes[np.any(self.offset[indexes] != 0, axis=1)]
+        self.co[moved] += self.offset[moved]
+        self.offset[moved] = 0
+        points = (self._handles[i] for i in moved.tolist())
+        owners = {id(point.owner_chain): point.owner_chain for point in points if point is not None and point.owner_chain is not None}
+        for chain in owners.values():
+            chain.mark_geometry_changed()
+
+
+class StoredVector(Vector2):
+    """A Vector2 view of a row of one of the store arrays, reads and in place changes (update, +=, scale_to_length...) go straight to the store.
+    The array is looked up on every access, so the view stays valid when the store grows"""
+    __slots__ = ("_store", "_name", "_index")
+    def __init__(self, store:PointStore, name:str, index:int) -> None:
+        self._store = store
+        self._name = name
+        self._index = index
+
+    @property
+    def x(self) -> float:
+        return float(getattr(self._store, self._name)[self._index, 0])
+
+    @x.setter
+    def x(self, value:float):
+        getattr(self._store, self._name)[self._index, 0] = value
+
+    @property
+    def y(self) -> float:
+        return float(getattr(self._store, self._name)[self._index, 1])
+
+    @y.setter
+    def y(self, value:float):
+        getattr(self._store, self._name)[self._index, 1] = value
+
+
+class StoredPoint(Point):
+    """A Point that is a thin handle to a row of a PointStore.
+    co and offset are StoredVector views of its rows, so they can be mutated in place like the vectors of a Point."""
+    def __init__(self, x, y, store:PointStore) -> None:
+        self.store = store
+        self.index = store.allocate(x, y, self)
+        self.connected_points = set()
+
+    store:PointStore
+    index:int
+
+    @property
+    def co(self) -> StoredVector:
+        return StoredVector(self.store, "co", self.index)
+
+    @co.setter
+    def co(self, value):
+        self.store.co[self.index] = (value[0], value[1])
+
+    @property
+    def offset(self) -> StoredVector:
+        return StoredVector(self.store, "offset", self.index)
+
+    @offset.setter
+    def offset(self, value):
+        self.store.offset[self.index] = (value[0], value[1])
+
+    def add_offset(self, x:float, y:float, multiplier=1):
+        offset = self.store.offset[self.index]
+        offset[0] += x * multiplier
+        offset[1] += y * multiplier
+
+    def _apply_offset(self, ignore_unmoving = False)->bool:
+        if (not ignore_unmoving) and self.is_unmoving:
+            return False
+        i = self.index
+        offset = self.store.offset[i]
+        if offset[0] == 0 and offset[1] == 0:
+            return False
+        self.store.co[i] += offset
+        offset[:] = 0
+        return True
+
+    def clamp_offset(self, clamp_value):
+        offset = self.offset
+        if offset.length_squared() > clamp_value*clamp_value:
+            offset.scale_to_length(clamp_value)
+
+    def sibling(self, x:float, y:float) -> "StoredPoint":
+        return StoredPoint(x, y, self.store)
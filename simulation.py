@@ -1,60 +1,84 @@
 import warnings
-import pygame
 import math
 from typing import List
 import state
 from chain import Chain
 from point import Point
 from blob import Blob
-def setup():
-    first_blob = create_frame_blob(state.width, state.height, state.link_length)
+from chain_batch import ChainBatch
+from half_edge import HalfEdgeGraph
+from phase_timer import PhaseTimer
+from world import World
+
+default_world = World.from_state() #stepped when no world is given, its blobs are state.blobs
+timer = default_world.timer
+
+def setup(world:World = None):
+    world = default_world if world is None else world
+    first_blob = create_frame_blob(world.width, world.height, world.link_length)
     if type(first_blob) != Blob:
             raise RuntimeError("this isn't a Blob", first_blob)
-    state.blobs.append(first_blob)
-    state.chains.update(first_blob.chain_loop)
-    state.point_of_interest = Point(x=state.width/2, y=state.height/2)
+    first_blob.set_blob_reference_on_chains()
+    world.blobs.append(first_blob)
+    world.half_edge_graph = HalfEdgeGraph.from_chains(first_blob.chain_loop) #spawning and cutting add their chains to it
+    world.point_of_interest = Point(x=world.width/2, y=world.height/2)
+
+def reset(world:World = None):
+    """forgets the world, so that setup can build a new one in the same process"""
+    (default_world if world is None else world).reset()
     
 hero_point = Point(0, 0)
-def simulate(dt:float):
-    state.frame_count+=1
+
+def simulate(world:World = None, dt:float = 0):
+    world = default_world if world is None else world
+    timer = world.timer
+    world.frame_count+=1
 
     #blob spawning
-    if state.frame_count%50 == 0 and len(state.blobs) < state.goal_blobs_num:
-        spawn_blob_in_largest_blob()
+    with timer.phase("spawning"):
+        if world.frame_count%50 == 0 and len(world.blobs) < world.goal_blobs_num:
+            spawn_blob_in_largest_blob(world)
 
-    movable_chains = state.get_movable_chains()
+    chains = world.chains
+    movable_chains = state.get_movable_chains(chains)
 
     #link_length and curve
-    for chain in movable_chains:
-        chain.enforce_link_length(link_length=state.link_length)
-        chain.enforce_minimum_secondary_joint_distance(distance=state.link_length*4, link_length=state.link_length)
+    with timer.phase("link length"):
+        world.chain_batch = ChainBatch.reuse_or_build(world.chain_batch, movable_chains)
+        world.chain_batch.enforce_link_length(link_length=world.link_length)
+    with timer.phase("secondary distance"):
+        world.chain_batch.enforce_minimum_secondary_joint_distance(distance=world.link_length*4, link_length=world.link_length)
     
     #area equalization
-    add_area_equalization_offset(movable_chains)
+    with timer.phase("area equalization"):
+        add_area_equalization_offset(world.blobs, world.resolution, movable_chains)
     
     # minimal_thickness
-    for blob in state.blobs:
-        blob.enforce_minimal_width(state.min_thinkness)
+    with timer.phase("minimal width"):
+        for blob in world.blobs:
+            blob.enforce_minimal_width(world.min_thinkness)
     
     # circumference equalization
     # should be handled by sliding the endpoint along 
-    for chain in movable_chains:
-        if chain.blob_left.point_number * chain.blob_right.point_number < state.goal_blob_point_number*state.goal_blob_point_number:
-            blob.find_biggest_gap_indexes
-            point_i = math.floor((chain.point_number-1)/2)
-            chain.create_midpoint(point_index=point_i, next_index=point_i+1)    
+    with timer.phase("circumference"):
+        goal_blob_point_number = world.goal_blob_point_number
+        for chain in movable_chains:
+            if chain.blob_left.point_number * chain.blob_right.point_number < goal_blob_point_number*goal_blob_point_number:
+                point_i = math.floor((chain.point_number-1)/2)
+                chain.create_midpoint(point_index=point_i, next_index=point_i+1)    
     
     # clamp offsets
-    for chain in state.chains:
-        for point in chain.points:
-            point.clamp_offset(state.resolution)
+    with timer.phase("clamp"):
+        for chain in chains:
+            for point in chain.points:
+                point.clamp_offset(world.resolution)
 
-    for chain in state.chains:
-        chain.apply_accumulated_offsets()
+    with timer.phase("apply"):
+        for chain in chains:
+            chain.apply_accumulated_offsets()
+    timer.end_frame(world.frame_count)
 
 def add_area_equalization_offset(blobs:list[Blob], resolution:float, movable_chains: List[Chain]):
-    for blob in blobs:
-        blob.recalculate_area()
     for chain in movable_chains:
         max_offset = resolution*2
         left_area, right_area = chain.blob_left.cashed_area, chain.blob_right.cashed_area
@@ -68,15 +92,16 @@ def add_area_equalization_offset(blobs:list[Blob], resolution:float, movable_cha
         chain.color = (255, (1-scale) * 225,  (1-scale) * 225)
         
 
-def spawn_blob_in_largest_blob():
-    big_blob = find_largest_blob()
-    new_blob, chains_to_register = big_blob.spawn_small_blob()
-    state.chains.update(chains_to_register)
-    state.blobs.append(new_blob)
+def spawn_blob_in_largest_blob(world:World = None):
+    world = default_world if world is None else world
+    big_blob = find_largest_blob(world.blobs)
+    new_blob, _ = big_blob.spawn_small_blob(rng=world.rng)
+    world.blobs.append(new_blob)
     
-def find_largest_blob():
-    largest_blob_so_far = state.blobs[0]
-    for blob in state.blobs:
+def find_largest_blob(blobs:list[Blob] = None):
+    blobs = default_world.blobs if blobs is None else blobs
+    largest_blob_so_far = blobs[0]
+    for blob in blobs:
         blob:Blob
         if blob.point_number > largest_blob_so_far.point_number:
             largest_blob_so_far = blob
@@ -86,17 +111,17 @@ def find_largest_blob():
 def create_frame_blob(width:float, height:float, link_length:float, margin=5)->Blob:
     m = margin
     tl, tr, br, bl = Point(m, m), Point(width-m, m), Point(width-m,height-m), Point(m, height-m)
-    top =    Chain.from_end_points(tl, tr, link_length=state.resolution)
-    bottom = Chain.from_end_points(bl, br, link_length=state.resolution)
-    left =   Chain.from_end_points(tl, bl, link_length=state.resolution)
-    right =  Chain.from_end_points(tr, br, link_length=state.resolution)
+    top =    Chain.from_end_points(tl, tr, link_length=link_length)
+    bottom = Chain.from_end_points(bl, br, link_length=link_length)
+    left =   Chain.from_end_points(tl, bl, link_length=link_length)
+    right =  Chain.from_end_points(tr, br, link_length=link_length)
     chain_loop = [top, left, bottom, right]
     blob =  Blob.from_chain_loop(chain_loop)
     # blob.is_unmoving_override = True 
     # - that is not a good idea, The spawned blobs wouldn't be able to move
-    # From the outside they have None as a blob (hence unmoving)
-    # From the inside they will have the frame blob, (hence unmoving)
-    #So only between two spawned blobs a chain will be able to move. But why, would it?
+    # only the outer chains hold still, cutting them hands the override to both halves
+    for chain in chain_loop:
+        chain.is_unmoving_override = True
     blob.link_length = link_length
     return blob
 
@@ -105,8 +130,7 @@ def enforce_minimal_width(blobs:list[Blob], minimal_width):
         blob.enforce_minimal_width(minimal_width)
 
 def enforce_link_length(chains:list[Chain], link_length:float):
-    for chain in chains:
-        chain.enforce_link_length(link_length)
+    ChainBatch(chains).enforce_link_length(link_length)
 
 def apply_offsets(chains:list[Chain]):
     for chain in chains:
@@ -157,17 +181,24 @@ def dissolve_2_chain_joints(joints:list[Point]):
             continue
         joint.dissolve_endpoint()
 
-def simulation_step(blobs:list[Blob], resolution:float, minimal_width:float):
+def simulation_step(blobs:list[Blob], resolution:float, minimal_width:float, timer:PhaseTimer = None):
+    timer = default_world.timer if timer is None else timer
     chains = state.get_chains_list(blobs)
     movable_chains = state.get_movable_chains(chains)
-    add_area_equalization_offset(blobs=blobs, resolution=resolution, movable_chains=movable_chains)
-    enforce_minimal_width(blobs, minimal_width)
-    enforce_link_length(chains=movable_chains, link_length=resolution)
+    with timer.phase("area equalization"):
+        add_area_equalization_offset(blobs=blobs, resolution=resolution, movable_chains=movable_chains)
+    with timer.phase("minimal width"):
+        enforce_minimal_width(blobs, minimal_width)
+    with timer.phase("link length"):
+        enforce_link_length(chains=movable_chains, link_length=resolution)
     smooth_out_shapes(blobs=blobs)
-    apply_offsets(movable_chains)
-    movable_joints = state.get_wandering_joints(movable_chains)
-    slide_joints(movable_joints)
-    dissolve_2_chain_joints(movable_joints)
+    with timer.phase("apply"):
+        apply_offsets(movable_chains)
+    with timer.phase("joint sliding"):
+        movable_joints = state.get_wandering_joints(movable_chains)
+        slide_joints(movable_joints)
+        dissolve_2_chain_joints(movable_joints)
+    timer.end_frame()
 
     
     
\ No newline at end of file
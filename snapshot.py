@@ -0,0 +1,153 @@
+"""Saves a whole world into one .npz file of flat arrays and loads it back, without pickling the object graph.
+Points are numbered in the order they are first met on the chains, a joint shared by several chains is stored once.
+Variable length lists (the points of every chain, the chains of every blob) are stored flat, next to the offsets where each one starts.
+
+arrays of a snapshot:
+    co, offset                  (points, 2) float64
+    point_unmoving              (points,) int8, -1 for no override, else the override
+    chain_points, chain_offsets the point indexes of every chain, chain i is chain_points[chain_offsets[i]:chain_offsets[i+1]]
+    chain_blobs                 (chains, 2) int64, the left and right blob indexes, -1 for none
+    chain_unmoving              (chains,) int8, like point_unmoving
+    loop_chains, loop_offsets   the chain indexes of every blob loop, in loop order
+    loop_backwards              bool per loop entry, whether the chain runs against the loop. Derived data, kept for offline readers
+    blob_link_lengths           (blobs,) float64, 0 if the blob never learned it
+    blob_unmoving               (blobs,) bool
+    world                       JSON text of the parameters, the frame count, the point of interest and the rng state
+"""
+import gc
+import json
+from typing import Dict, List
+import numpy as np
+from blob import Blob
+from chain import Chain
+from half_edge import HalfEdgeGraph
+from point import Point
+from world import World
+
+FORMAT_VERSION = 1
+WORLD_PARAMETERS = ["width", "height", "resolution", "link_length", "min_thinkness", "goal_blobs_num", "seed"]
+
+
+def _override_code(override)->int:
+    return -1 if override is None else int(override)
+
+def _flatten(lists:List[List[int]])->tuple[np.ndarray, np.ndarray]:
+    offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+    np.cumsum([len(l) for l in lists], out=offsets[1:])
+    flat = np.fromiter((i for l in lists for i in l), dtype=np.int64, count=int(offsets[-1]))
+    return flat, offsets
+
+def number_points(chains:List[Chain])->tuple[List[Point], np.ndarray, np.ndarray]:
+    """every point of the chains once, in the order they are first met, and the flat point indexes of every chain with their offsets"""
+    point_indexes:Dict[int, int] = dict()
+    points:List[Point] = []
+    chain_point_lists = []
+    for chain in chains:
+        indexes = []
+        for point in chain.points:
+            index = point_indexes.get(id(point))
+            if index is None:
+                index = point_indexes[id(point)] = len(points)
+                points.append(point)
+            indexes.append(index)
+        chain_point_lists.append(indexes)
+    chain_points, chain_offsets = _flatten(chain_point_lists)
+    return points, chain_points, chain_offsets
+
+def coordinates_of(points:List[Point])->np.ndarray:
+    return np.array([(p.co.x, p.co.y) for p in points], dtype=np.float64).reshape(-1, 2)
+
+def to_arrays(world:World)->Dict[str, np.ndarray]:
+    chains = world.chains
+    chain_indexes = {id(chain): i for i, chain in enumerate(chains)}
+    blob_indexes = {id(blob): i for i, blob in enumerate(world.blobs)}
+    points, chain_points, chain_offsets = number_points(chains)
+    loop_chains, loop_offsets = _flatten([[chain_indexes[id(chain)] for chain in blob.chain_loop] for blob in world.blobs])
+
+    def blob_index(blob):
+        return -1 if blob is None else blob_indexes.get(id(blob), -1)
+    world_record = {name: getattr(world, name) for name in WORLD_PARAMETERS}
+    world_record.update({
+        "format_version": FORMAT_VERSION,
+        "goal_blob_point_number": world.goal_blob_point_number_override,
+        "frame_count": world.frame_count,
+        "point_of_interest": None if world.point_of_interest is None else list(world.point_of_interest.co),
+        "rng_state": world.rng.getstate(),
+    })
+    return {
+        "co": coordinates_of(points),
+        "offset": np.array([(p.offset.x, p.offset.y) for p in points], dtype=np.float64).reshape(-1, 2),
+        "point_unmoving": np.array([_override_code(p.is_unmoving_override) for p in points], dtype=np.int8),
+        "chain_points": chain_points,
+        "chain_offsets": chain_offsets,
+        "chain_blobs": np.array([(blob_index(c.blob_left), blob_index(c.blob_right)) for c in chains], dtype=np.int64).reshape(-1, 2),
+        "chain_unmoving": np.array([_override_code(c.is_unmoving_override) for c in chains], dtype=np.int8),
+        "loop_chains": loop_chains,
+        "loop_offsets": loop_offsets,
+        "loop_backwards": np.array([blob.is_chain_backwards(chain_index=i) for blob in world.blobs for i in range(len(blob.chain_loop))], dtype=bool),
+        "blob_link_lengths": np.array([blob.known_link_length or 0 for blob in world.blobs], dtype=np.float64),
+        "blob_unmoving": np.array([bool(blob.is_unmoving_override) for blob in world.blobs], dtype=bool),
+        "world": np.array(json.dumps(world_record)),
+    }
+
+def from_arrays(arrays:Dict[str, np.ndarray])->World:
+    record = json.loads(str(arrays["world"]))
+    if record.get("format_version") != FORMAT_VERSION:
+        raise ValueError("Unsupported snapshot format version", record.get("format_version"))
+    world = World(**{name: record[name] for name in WORLD_PARAMETERS}, goal_blob_point_number=record["goal_blob_point_number"])
+    world.frame_count = record["frame_count"]
+    if record["point_of_interest"] is not None:
+        world.point_of_interest = Point(*record["point_of_interest"])
+    version, internal_state, gauss_next = record["rng_state"]
+    world.rng.setstate((version, tuple(internal_state), gauss_next))
+
+    points = [Point(x, y) for x, y in arrays["co"].tolist()]
+    for point, (dx, dy), code in zip(points, arrays["offset"].tolist(), arrays["point_unmoving"].tolist()):
+        if dx != 0 or dy != 0:
+            point.offset.update(dx, dy)
+        if code >= 0:
+            point.is_unmoving_override = bool(code)
+
+    chain_points, chain_offsets = arrays["chain_points"].tolist(), arrays["chain_offsets"].tolist()
+    chains = []
+    for start, end in zip(chain_offsets[:-1], chain_offsets[1:]):
+        chain = Chain()
+        chain.points = [points[i] for i in chain_points[start:end]]
+        chain.mark_topology_changed()
+        for a, b in zip(chain.points, chain.points[1:]): #what from_point_list does with connect_point, without its checks
+            a.connected_points.add(b)
+            b.connected_points.add(a)
+        chains.append(chain)
+    for chain, code in zip(chains, arrays["chain_unmoving"].tolist()):
+        if code >= 0:
+            chain.is_unmoving_override = bool(code)
+
+    loop_chains, loop_offsets = arrays["loop_chains"].tolist(), arrays["loop_offsets"].tolist()
+    for start, end, link_length, unmoving in zip(loop_offsets[:-1], loop_offsets[1:], arrays["blob_link_lengths"].tolist(), arrays["blob_unmoving"].tolist()):
+        blob = Blob.from_chain_loop([chains[i] for i in loop_chains[start:end]])
+        if link_length != 0:
+            blob.link_length = link_length
+        blob.is_unmoving_override = unmoving
+        world.blobs.append(blob)
+
+    blobs = world.blobs
+    for chain, (left, right) in zip(chains, arrays["chain_blobs"].tolist()):
+        chain.set_blobs(left=None if left < 0 else blobs[left], right=None if right < 0 else blobs[right])
+    world.half_edge_graph = HalfEdgeGraph.from_chains(chains)
+    return world
+
+def save(world:World, path, compressed:bool = False):
+    """writes the world into an .npz file, compressed ones are smaller but slower to write and read"""
+    (np.savez_compressed if compressed else np.savez)(path, **to_arrays(world))
+
+def load(path)->World:
+    with np.load(path, allow_pickle=False) as arrays:
+        arrays = {name: arrays[name] for name in arrays.files}
+    #the collector would walk the growing object graph again and again while hundreds of thousands of objects are created
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return from_arrays(arrays)
+    finally:
+        if was_enabled:
+            gc.enable()
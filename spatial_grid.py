@@ -0,0 +1,61 @@
+import numpy as np
+
+#each unordered pair of neighboring cells is visited once
+_HALF_NEIGHBORHOOD = [(0, 0), (1, -1), (1, 0), (1, 1), (0, 1)]
+
+
+def close_pairs(coordinates:np.ndarray, radius:float)->tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Finds all pairs of points that are at most radius apart, using a uniform grid of radius sized cells.
+
+    Parameters:
+    - coordinates: (n, 2) array of point coordinates.
+    - radius: the largest distance of a reported pair.
+
+    Returns:
+    - a, b: index arrays into coordinates, with a < b for every pair.
+    - distances: distance between the points of every pair.
+    """
+    empty = np.empty(0, dtype=np.intp)
+    if len(coordinates) < 2 or not radius > 0:
+        return empty, empty, np.empty(0)
+
+    cells = np.floor(coordinates / radius).astype(np.int64)
+    cells -= cells.min(axis=0)
+    # the margin keeps the keys of the neighbors of one column from wrapping into the next column
+    column_height = int(cells[:, 1].max()) + 3
+    keys = cells[:, 0] * column_height + cells[:, 1]
+    order = np.argsort(keys, kind="stable")
+    cell_keys, starts, counts = np.unique(keys[order], return_index=True, return_counts=True)
+
+    a_parts, b_parts = [], []
+    for dx, dy in _HALF_NEIGHBORHOOD:
+        neighbor_keys = cell_keys + dx * column_height + dy
+        positions = np.minimum(np.searchsorted(cell_keys, neighbor_keys), len(cell_keys) - 1)
+        found = cell_keys[positions] == neighbor_keys
+        cells_a, cells_b = np.flatnonzero(found), positions[found]
+        counts_a, counts_b = counts[cells_a], counts[cells_b]
+        pair_counts = counts_a * counts_b
+        total = int(pair_counts.sum())
+        if total == 0:
+            continue
+        #expand every pair of cells into the cross product of their points
+        cell_pair = np.repeat(np.arange(len(cells_a)), pair_counts)
+        local = np.arange(total) - (np.cumsum(pair_counts) - pair_counts)[cell_pair]
+        counts_b = counts_b[cell_pair]
+        a = starts[cells_a][cell_pair] + local // counts_b
+        b = starts[cells_b][cell_pair] + local % counts_b
+        if (dx, dy) == (0, 0):
+            keep = a < b
+            a, b = a[keep], b[keep]
+        a_parts.append(order[a])
+        b_parts.append(order[b])
+
+    if not a_parts:
+        return empty, empty, np.empty(0)
+    a, b = np.concatenate(a_parts), np.concatenate(b_parts)
+    diff = coordinates[b] - coordinates[a]
+    distances = np.hypot(diff[:, 0], diff[:, 1])
+    close = distances <= radius
+    a, b, distances = a[close], b[close], distances[close]
+    return np.minimum(a, b), np.maximum(a, b), distances
@@ -1,6 +1,5 @@
 import math
 
-import pygame
 from chain import Chain
 from typing import Set, List
 from blob import Blob
@@ -12,6 +11,8 @@ height = 480
 # chains: Set[Chain] = set() 
 #it is preferrable to derive it each frame, as it will clearly become cumbersome to keep track of them. 
 
+#the module globals are the parameters of the default world, simulation.default_world,
+#which shares this list of blobs. Other worlds are built with world.World
 blobs: List[Blob] = list()
 lesser_dimention = min(width, height)
 resolution = lesser_dimention/100
@@ -22,21 +23,23 @@ expected_blob_area = width * height/goal_blobs_num
 square_cirumference =  math.sqrt(expected_blob_area)*4
 goal_blob_circumference = square_cirumference * 1.5
 goal_blob_point_number = math.ceil(goal_blob_circumference/link_length)
+seed = None #of the random choices of the default world, None lets the operating system pick one
 
-frame_count = 0
-
-point_of_interest:Point = None
+simulation_step_seconds = 1/60
+substeps = 1 #simulate calls per simulation step
+max_catch_up_steps = 5 #steps run after a stall at most, the remaining backlog is dropped
+show_phase_timings = False #overlay of the timer of the drawn world
 
 def draw_callback()->None:
     raise RuntimeError("Forgot to set the draw callback in main_file")
 
-screen = pygame.display.get_surface()
-
-def get_chains_list(blobs:list[Blob]):
-    chains = set()
+def get_chains_list(blobs:list[Blob])->list[Chain]:
+    """every chain of the blobs once, a chain between two blobs is shared by both of them"""
+    chains = dict()
     for blob in blobs:
-        chains.update(blob.chain_loop)
-    return chains
+        for chain in blob.chain_loop:
+            chains[id(chain)] = chain
+    return list(chains.values())
 
 def get_movable_chains(chains:list[Chain]):
     return [chain for chain in chains if not chain.is_unmoving]
@@ -0,0 +1,89 @@
+"""Runs a grid of parameter sets as headless simulations on every core, one world per task.
+python sweep.py --resolution 3.6 4.8 --min-thinkness 36 48 --goal-blobs-num 6 10 [--frames 600] [--output sweep.csv]
+Every task is seeded with seed + its index in the grid, so a sweep gives the same table on every run."""
+import argparse
+import csv
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+import numpy as np
+import headless
+from world import World
+
+PARAMETERS = ["resolution", "min_thinkness", "goal_blobs_num", "goal_blob_point_number"]
+METRICS = ["frames", "converged", "blobs", "area_variance", "mean_frame_seconds", "seconds"]
+TOLERANCE_PER_RESOLUTION = 0.01 #a run has converged once no point moves further than this many resolutions in a frame
+
+
+def parameter_grid(values:Dict[str, List])->List[Dict]:
+    """every combination of the given values, the parameters without values are left to the World defaults"""
+    names = [name for name in PARAMETERS if values.get(name)]
+    return [dict(zip(names, combination)) for combination in itertools.product(*(values[name] for name in names))]
+
+def area_variance(world:World)->float:
+    areas = [blob.calculate_area() for blob in world.blobs]
+    return float(np.var(areas)) if areas else 0.0
+
+def run_task(task:Dict)->Dict:
+    """runs in a worker process: builds the world of the parameters and steps it until it settles or runs out of frames"""
+    world = World(**task["parameters"], seed=task["seed"])
+    tolerance = TOLERANCE_PER_RESOLUTION * world.resolution if task["tolerance"] is None else task["tolerance"]
+    report = headless.run(task["frames"], tolerance, world=world)
+    return {
+        **task["parameters"],
+        "seed": task["seed"],
+        "frames": report["frames"],
+        "converged": report["converged"],
+        "blobs": report["blobs"],
+        "area_variance": area_variance(world),
+        "mean_frame_seconds": report["seconds"] / max(1, report["frames"]),
+        "seconds": report["seconds"],
+    }
+
+def sweep(parameter_sets:List[Dict], frames:int, tolerance:Optional[float] = None, seed:int = 0, workers:Optional[int] = None)->List[Dict]:
+    """one row per parameter set, in the order of the sets. workers defaults to every core,
+    tolerance to TOLERANCE_PER_RESOLUTION times the resolution of each run"""
+    tasks = [{"parameters": parameters, "seed": seed + i, "frames": frames, "tolerance": tolerance}
+             for i, parameters in enumerate(parameter_sets)]
+    if workers == 1:
+        return [run_task(task) for task in tasks] #no pool to start, handy for debugging
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run_task, tasks))
+
+def columns_of(rows:List[Dict])->List[str]:
+    return [name for name in PARAMETERS if any(name in row for row in rows)] + ["seed"] + METRICS
+
+def format_table(rows:List[Dict])->str:
+    columns = columns_of(rows)
+    def cell(value):
+        return f"{value:.4g}" if isinstance(value, float) else str(value)
+    table = [columns] + [[cell(row.get(name, "")) for name in columns] for row in rows]
+    widths = [max(len(line[i]) for line in table) for i in range(len(columns))]
+    return "\n".join("  ".join(text.rjust(width) for text, width in zip(line, widths)) for line in table)
+
+def write_csv(rows:List[Dict], path:str):
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=columns_of(rows))
+        writer.writeheader()
+        writer.writerows(rows)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a grid of parameter sets as headless simulations in a process pool")
+    parser.add_argument("--resolution", type=float, nargs="+")
+    parser.add_argument("--min-thinkness", type=float, nargs="+")
+    parser.add_argument("--goal-blobs-num", type=int, nargs="+")
+    parser.add_argument("--goal-blob-point-number", type=int, nargs="+")
+    parser.add_argument("--frames", type=int, default=600, help="upper limit of simulated frames per run")
+    parser.add_argument("--tolerance", type=float, default=None, help=f"a run stops once no point moves further than this in a frame, {TOLERANCE_PER_RESOLUTION} x the resolution of the run by default")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first run, the next ones count up from it")
+    parser.add_argument("--workers", type=int, default=None, help=f"processes, all {os.cpu_count()} cores by default")
+    parser.add_argument("--output", default="sweep.csv", help="result table")
+    args = parser.parse_args(argv)
+    parameter_sets = parameter_grid({name: getattr(args, name) for name in PARAMETERS})
+    rows = sweep(parameter_sets, args.frames, args.tolerance, args.seed, args.workers)
+    write_csv(rows, args.output)
+    print(format_table(rows))
+
+if __name__ == "__main__":
+    main()
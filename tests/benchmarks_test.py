@@ -0,0 +1,59 @@
+import json
+import pytest
+import state
+from benchmarks.worlds import create_grid_world
+from benchmarks.scaling import format_report, run
+from benchmarks.baseline import compare, format_comparisons, load, record, slower_p_value
+from benchmarks import import_time
+
+
+def test_grid_world_is_valid():
+    blobs = create_grid_world(7, link_length=10)
+    assert len(blobs) == 7
+    for blob in blobs:
+        blob.assert_is_valid()
+    chains = state.get_chains_list(blobs)
+    shared = [chain for chain in chains if chain.blob_left is not None and chain.blob_right is not None]
+    assert len(shared) == 8
+    assert all(not chain.is_unmoving for chain in shared)
+    assert len(chains) - len(shared) == sum(chain.is_unmoving for chain in chains)
+
+def test_scaling_run_reports_every_operation():
+    link_length = state.link_length
+    report = run(sizes=[1, 4], resolutions=[16.0], repeats=1)
+    assert state.link_length == link_length
+    assert state.blobs == []
+    operations = {r["operation"] for r in report["results"]}
+    assert operations == {"simulate", "calculate_area", "find_local_minimum_width", "get_chain_loops_from_chains", "spawn_small_blob"}
+    assert set(report["scaling"]) == operations
+    assert "scaling exponents" in format_report(report)
+
+def test_slower_p_value():
+    fast = [1.0, 1.1, 0.9, 1.05, 0.95, 1.0, 1.02, 0.98]
+    slow = [x * 2 for x in fast]
+    assert slower_p_value(fast, slow) < 0.01
+    assert slower_p_value(slow, fast) > 0.99
+    assert 0.3 < slower_p_value(fast, fast) < 0.7
+    assert slower_p_value([1.0] * 5, [1.0] * 5) == 1.0
+
+def test_baseline_round_trip(tmp_path):
+    configuration = {"blobs": 2, "link_length": 16.0, "repeats": 3}
+    baseline = record(configuration)
+    path = tmp_path / "baseline.json"
+    path.write_text(json.dumps(baseline))
+    loaded = load(str(path))
+    assert loaded["configuration"] == configuration
+    samples = {name: [recorded["median_seconds"] * 3] * 3 for name, recorded in loaded["operations"].items()}
+    comparisons = compare(loaded, samples, threshold=0.1, alpha=0.5)
+    assert {c["operation"] for c in comparisons} == set(loaded["operations"])
+    assert all(c["ratio"] == pytest.approx(3) for c in comparisons if c["baseline_median_seconds"] > 0)
+    assert "SLOWER" in format_comparisons(comparisons)
+    path.write_text(json.dumps(dict(baseline, format_version=0)))
+    with pytest.raises(ValueError):
+        load(str(path))
+
+def test_core_imports_without_pygame():
+    records = import_time.run(["point", "chain", "blob", "planar_graph", "simulation"], repeats=1)
+    assert [r["pygame_modules"] for r in records] == [[]] * 5
+    assert all(r["median_seconds"] > 0 for r in records)
+    assert "not loaded" in import_time.format_report(records)
@@ -1,6 +1,7 @@
 
 
-from pygame import Vector2
+import math
+from vector import Vector2
 import pytest
 from blob import Blob
 from chain import Chain
@@ -284,4 +285,236 @@ def test_create_valid_blob_collection():
     assert len(blobs)==5
     for blob in blobs:
         blob.assert_is_valid()
-    assert_no_doubles_in_list(blobs) 
\ No newline at end of file
+    assert_no_doubles_in_list(blobs) 
+def naive_points_list(blob:Blob):
+    points = []
+    for i, chain in enumerate(blob.chain_loop):
+        chain_points = chain.points[:-1] if not blob.is_chain_backwards(i) else chain.points[::-1][:-1]
+        points.extend(chain_points)
+    return points
+
+def test_cached_chain_index_follows_topology_changes():
+    blob = create_valid_blob(point_density=2)
+    assert blob.points_list == naive_points_list(blob)
+    version = blob.topology_version
+    blob.get_point(3)
+    assert blob.topology_version == version, "reading should not invalidate the index"
+
+    blob.chain_loop[1].create_midpoint(0, 1) #changes a chain behind the blob's back
+    assert blob.topology_version != version
+    assert blob.point_number == len(naive_points_list(blob))
+    assert blob.points_list == naive_points_list(blob)
+
+    blob.chain_loop.reverse() #in place edit of the loop
+    assert blob.points_list == naive_points_list(blob)
+    blob.assert_is_valid()
+
+    blob.cut_at(5)
+    blob.create_midpoint(7, 8)
+    blob.remove_point(2)
+    assert blob.points_list == naive_points_list(blob)
+    for i in range(blob.point_number):
+        chain, chain_point_i = blob.get_chain_and_on_chain_point_index_at(i)
+        assert chain.points[chain_point_i] is blob.get_point(i)
+        assert blob.is_intersection_at(i) == (i in [0] + blob.intersection_indexes[:-1])
+
+def test_topology_version_ignores_other_blobs():
+    blob, other = create_valid_blob(point_density=2), create_valid_blob(point_density=2)
+    version, revision = blob.topology_version, blob.geometry_revision
+    offsets = blob._chain_offsets()
+    other.chain_loop[0].create_midpoint(0, 1)
+    Chain.from_coord_list([(0, 0), (1, 1)])
+    assert blob.topology_version == version
+    assert blob.geometry_revision == revision
+    assert blob._chain_offsets() is offsets, "the index of an unchanged blob should not be rebuilt"
+    blob.chain_loop[0].create_midpoint(0, 1)
+    assert blob.topology_version != version
+
+def test_topology_version_follows_every_change_of_a_chain():
+    blob = create_valid_blob(point_density=2)
+    chain = blob.chain_loop[1]
+    for change in [lambda: chain.create_midpoint(0, 1), lambda: chain.remove_point(1), lambda: chain.create_midpoint(1, 2)]:
+        version, point_number = blob.topology_version, blob.point_number
+        change()
+        assert blob.topology_version == version + 1
+        assert blob.point_number != point_number
+    assert list(blob.iter_points()) == naive_points_list(blob)
+
+def test_ring_iteration_and_derived_properties():
+    blob = create_valid_blob(point_density=2)
+    blob.chain_loop[2].create_midpoint(1, 2)
+    assert list(blob.iter_points()) == naive_points_list(blob)
+    co = blob.coordinates_array()
+    assert co.shape == (blob.point_number, 2)
+    for (x, y), point in zip(co, blob.iter_points()):
+        assert (x, y) == (point.co.x, point.co.y)
+    assert blob.calculate_area() == pytest.approx(100*100)
+    assert blob.actual_circumference == pytest.approx(400)
+    x, y = blob.true_centroid
+    assert x == pytest.approx(sum(p.co.x for p in naive_points_list(blob))/blob.point_number)
+    assert y == pytest.approx(sum(p.co.y for p in naive_points_list(blob))/blob.point_number)
+
+    from point_store import PointStore
+    PointStore().adopt(blob.points_list)
+    assert (blob.coordinates_array() == co).all()
+
+def test_geometry_cache_follows_point_moves():
+    blob = create_valid_blob()
+    assert blob.area == pytest.approx(100*100)
+    revision = blob.geometry_revision
+    assert blob.geometry_revision == revision, "an unchanged blob should keep its revision"
+    assert blob.area == pytest.approx(100*100)
+
+    chain = blob.chain_loop[1]
+    middle = chain.points[1]
+    middle.add_offset(0, 10)
+    chain.apply_accumulated_offsets(ignore_unmoving_status=True)
+    assert blob.geometry_revision != revision
+    assert blob.area == pytest.approx(blob.calculate_area())
+    assert blob.area != pytest.approx(100*100)
+
+    #a corner moved through a chain that isn't part of the blob
+    corner = blob.get_point(0)
+    outside_chain = Chain.from_point_list([corner, Point(-50, -50)])
+    revision = blob.geometry_revision
+    corner.add_offset(-10, 0)
+    outside_chain.apply_accumulated_offsets(ignore_unmoving_status=True)
+    assert blob.geometry_revision != revision
+    assert blob.area == pytest.approx(blob.calculate_area())
+    assert blob.true_centroid == pytest.approx(blob.calculate_true_centroid())
+    assert blob.actual_circumference == pytest.approx(blob.calculate_circumference())
+
+def test_geometry_cache_follows_points_moved_outside_their_chain():
+    blob = create_valid_blob(point_density=2)
+    assert blob.area == pytest.approx(100*100)
+    x, _ = blob.true_centroid
+    middle = blob.chain_loop[1].points[2]
+    middle.add_offset(20, 20)
+    middle.apply_accumulated_offset(ignore_unmoving=True)
+    assert blob.area == pytest.approx(blob.calculate_area())
+    assert blob.area != pytest.approx(100*100)
+    assert blob.true_centroid[0] != pytest.approx(x)
+    blob.apply_accumulated_offsets()
+    assert blob.area == pytest.approx(blob.calculate_area())
+
+    from point_store import PointStore
+    store = PointStore()
+    store.adopt(blob.points_list)
+    area = blob.area
+    middle = blob.chain_loop[3].points[1]
+    middle.add_offset(-20, -20)
+    store.apply_offsets()
+    assert blob.area == pytest.approx(blob.calculate_area())
+    assert blob.area != pytest.approx(area)
+    blob.apply_accumulated_offsets()
+    assert blob.area == pytest.approx(blob.calculate_area())
+
+def test_incremental_area_matches_full_recompute():
+    points, chains, blobs = create_valid_blob_collection()
+    for blob in blobs:
+        assert blob.area == pytest.approx(blob.calculate_area())
+    signed_areas = [blob.signed_area for blob in blobs]
+    for frame in range(30):
+        for i, point in enumerate(points):
+            if (i + frame) % 3 == 0:
+                point.add_offset(((i * 7 + frame) % 5 - 2) * 0.01, ((i * 3 + frame) % 4 - 1.5) * 0.01)
+        for chain in chains:
+            chain.apply_accumulated_offsets(ignore_unmoving_status=True)
+        for blob in blobs:
+            assert blob.area == pytest.approx(blob.calculate_area(), abs=1e-9)
+    for blob, signed_area in zip(blobs, signed_areas):
+        assert (blob.signed_area > 0) == (signed_area > 0), "orientation should survive small moves"
+
+def create_peanut_blob(point_number = 60):
+    coords = []
+    for i in range(point_number):
+        t = math.tau * i / point_number
+        r = 100 * (1 - 0.7 * math.cos(t)**2) + 20
+        coords.append((r * math.sin(t) * 1.6, r * math.cos(t)))
+    chain = Chain.from_coord_list(coords)
+    chain.close()
+    return Blob.from_chain_loop([chain])
+
+def test_exact_minimum_width():
+    blob = create_peanut_blob()
+    index_berth = 8
+    best = (math.inf, -1, -1)
+    for a in range(blob.point_number):
+        for b in range(a+1, blob.point_number):
+            if blob.index_distance(a, b) > index_berth:
+                best = min(best, (blob.points_distance(a, b), a, b))
+    width, expected_a, expected_b = best
+    a, b, found_width = blob.find_minimum_width_pair_under_target_width(index_berth=index_berth, target_width=width * 1.5)
+    assert found_width == pytest.approx(width)
+    assert {a, b} == {expected_a, expected_b}
+    _, _, local_width = blob.find_local_minimum_width_pair_under_target_width(sample_number=3, index_berth=index_berth, target_width=width * 1.5)
+    assert found_width <= local_width
+    assert blob.find_minimum_width_pair_under_target_width(index_berth=index_berth, target_width=width * 0.9) == (-1, -1, math.inf)
+
+def test_minimum_width_search_warm_starts_from_previous_frame():
+    blob = create_peanut_blob()
+    index_berth = 8
+    cold = blob.find_local_minimum_width_pair_under_target_width(sample_number=6, index_berth=index_berth, target_width=1000)
+    calls = []
+    original_points_distance = blob.points_distance
+    def counting_points_distance(a, b):
+        calls.append((a, b))
+        return original_points_distance(a, b)
+    blob.points_distance = counting_points_distance
+    warm = blob.find_local_minimum_width_pair_under_target_width(sample_number=6, index_berth=index_berth, target_width=1000)
+    warm_calls = len(calls)
+    assert warm == cold
+    # the remembered pairs are already local minimums, so only their neighbourhoods get checked
+    assert warm_calls <= 9 * len(blob._remembered_width_pairs)
+
+    a, b, width = warm
+    blob.create_midpoint(0, 1)
+    shifted = (a + (a >= 1), b + (b >= 1))
+    assert blob.points_distance(*shifted) == pytest.approx(width)
+    _, _, width_after_insertion = blob.find_local_minimum_width_pair_under_target_width(sample_number=6, index_berth=index_berth, target_width=1000)
+    assert width_after_insertion <= width + 1e-9
+    blob.remove_point(1)
+    assert blob._current_remembered_width_pairs() != []
+    _, _, width_after_removal = blob.find_local_minimum_width_pair_under_target_width(sample_number=6, index_berth=index_berth, target_width=1000)
+    assert width_after_removal <= width_after_insertion + 1e-9
+
+def create_pinched_square_blob():
+    tl, bl, br, tr = Point(0, 0), Point(0, 100), Point(100, 100), Point(100, 0)
+    left = Chain.from_end_points(tl, bl, point_num=3)
+    bottom = Chain.from_end_points(bl, br, point_num=3)
+    right = Chain.from_end_points(br, tr, point_num=3)
+    top = Chain.from_end_points(tr, tl, point_num=3)
+    blob = Blob.from_chain_loop([left, bottom, right, top])
+    top_point = top.points[1]
+    bottom_point = bottom.points[1]
+    top_point.co.update(50, 40)
+    bottom_point.co.update(50, 65)
+    return blob, top_point, bottom_point, bottom, [tl, bl, br, tr]
+
+def test_enforce_minimal_width_repels_pinched_points():
+    blob, top_point, bottom_point, _, corners = create_pinched_square_blob()
+    blob.enforce_minimal_width(10)
+    assert all(p.offset.length_squared() == 0 for p in blob.points_list)
+    blob.enforce_minimal_width(50)
+    assert all(p.offset.length_squared() == 0 for p in corners)
+    expected_top, expected_bottom = Point(*top_point.co), Point(*bottom_point.co)
+    expected_top.mutually_repel(expected_bottom, target_distance=50)
+    assert tuple(top_point.offset) == pytest.approx(tuple(expected_top.offset))
+    assert tuple(bottom_point.offset) == pytest.approx(tuple(expected_bottom.offset))
+    blob.apply_accumulated_offsets()
+    assert bottom_point.co.distance_to(top_point.co) == pytest.approx(50)
+
+def test_enforce_minimal_width_respects_unmoving_chains():
+    blob, top_point, bottom_point, bottom, _ = create_pinched_square_blob()
+    bottom.is_unmoving_override = True
+    blob.enforce_minimal_width(50)
+    assert bottom_point.offset.length_squared() == 0
+    assert top_point.offset.length() == pytest.approx(25)
+    blob.apply_accumulated_offsets()
+    assert bottom_point.co.distance_to(top_point.co) == pytest.approx(50)
+
+    blob, top_point, bottom_point, bottom, _ = create_pinched_square_blob()
+    bottom.is_unmoving_override = True
+    blob.enforce_minimal_width(50, ignore_umoving_status=True)
+    assert bottom_point.offset.length() == pytest.approx(12.5)
+    assert top_point.offset.length() == pytest.approx(12.5)
@@ -0,0 +1,91 @@
+import pytest
+from point import Point
+from chain import Chain
+from chain_batch import ChainBatch
+from point_store import PointStore
+from blob_test import create_valid_blob_collection
+
+
+def offsets_of(points):
+    return [(p.offset.x, p.offset.y) for p in points]
+
+def reset_offsets(points):
+    for p in points:
+        p.offset = p.offset * 0
+
+def assert_offsets_match(points, expected):
+    for (x, y), (ex, ey) in zip(offsets_of(points), expected):
+        assert x == pytest.approx(ex, abs=1e-9)
+        assert y == pytest.approx(ey, abs=1e-9)
+
+def distort(points):
+    for i, p in enumerate(points):
+        p.co = p.co + ((i*7)%5 * 0.1, (i*3)%4 * -0.1)
+
+def test_batched_link_length_matches_per_chain_method():
+    points, chains, _ = create_valid_blob_collection()
+    distort(points)
+    for chain in chains:
+        chain.enforce_link_length(0.7, ignore_umoving_status=True)
+    expected = offsets_of(points)
+    reset_offsets(points)
+    ChainBatch(chains).enforce_link_length(0.7, ignore_umoving_status=True)
+    assert_offsets_match(points, expected)
+
+def test_batched_link_length_respects_unmoving_chains():
+    points, chains, _ = create_valid_blob_collection()
+    chains[3].is_unmoving_override = True
+    stuck = Chain.from_point_list([Point(10, 10), Point(13, 10)])
+    for p in stuck.points:
+        p.is_unmoving_override = True
+    chains.append(stuck)
+    for chain in chains:
+        chain.enforce_link_length(0.5)
+    expected = offsets_of(points + stuck.points)
+    reset_offsets(points + stuck.points)
+    ChainBatch(chains).enforce_link_length(0.5)
+    assert_offsets_match(points + stuck.points, expected)
+    assert stuck.points[0].offset.length() == 0
+
+def test_batched_link_length_on_stored_points():
+    points, chains, _ = create_valid_blob_collection()
+    distort(points)
+    for chain in chains:
+        chain.enforce_link_length(1.3)
+    expected = offsets_of(points)
+    reset_offsets(points)
+    store = PointStore()
+    store.adopt(points)
+    batch = ChainBatch(chains)
+    assert batch.store is store
+    batch.enforce_link_length(1.3)
+    assert_offsets_match(points, expected)
+
+def test_batched_secondary_joint_distance_matches_per_chain_method():
+    store = PointStore()
+    start, end = store.create_point(0, 0), store.create_point(10, 0)
+    wavy = Chain.from_end_points(start, end, point_num=21)
+    for i, p in enumerate(wavy.points):
+        p.co = (p.co.x * (0.3 if i%2 else 0.4), (i%3) * 0.2)
+    straight = Chain.from_end_points(Point(0, 5), Point(2, 5), point_num=6)
+    frozen = Chain.from_end_points(Point(0, 8), Point(1, 8), point_num=6)
+    frozen.is_unmoving_override = True
+    chains = [wavy, straight, frozen]
+    points = [p for chain in chains for p in chain.points]
+    for chain in chains:
+        chain.enforce_minimum_secondary_joint_distance(distance=2, link_length=0.5)
+    expected = offsets_of(points)
+    reset_offsets(points)
+    ChainBatch(chains).enforce_minimum_secondary_joint_distance(distance=2, link_length=0.5)
+    assert_offsets_match(points, expected)
+    assert any(p.offset.length() > 0 for p in wavy.points)
+    assert all(p.offset.length() == 0 for p in frozen.points)
+
+def test_batch_is_rebuilt_only_after_topology_change():
+    _, chains, _ = create_valid_blob_collection()
+    batch = ChainBatch.reuse_or_build(None, chains)
+    assert ChainBatch.reuse_or_build(batch, chains) is batch
+    chains[10].create_midpoint(0, 1)
+    rebuilt = ChainBatch.reuse_or_build(batch, chains)
+    assert rebuilt is not batch
+    assert rebuilt.point_number == batch.point_number + 1
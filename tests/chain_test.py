@@ -1,5 +1,4 @@
-import pygame
-from pygame import Vector2
+from vector import Vector2
 import pytest
 from point import Point
 from chain import Chain
@@ -29,9 +28,10 @@ def test_is_endpoint_of_chain():
 def test_chain_initialization():
     c = Chain()
     assert c.points == []
-    assert c.color == pygame.Color("white")
     with pytest.raises(AssertionError):
         c.assert_is_valid() #an empty chain is not valid
+    pygame = pytest.importorskip("pygame")
+    assert c.color == pygame.Color("white")
 
 
 def test_point_start_and_end():
@@ -40,8 +40,9 @@ def test_point_start_and_end():
     c = Chain.from_point_list([p1, p2])
     assert c.point_start == p1
     assert c.point_end == p2
-    assert c.color == pygame.Color("white")
     c.assert_is_valid()
+    pygame = pytest.importorskip("pygame")
+    assert c.color == pygame.Color("white")
 
 def test_points_number():
     p1 =Point(0, 0)
@@ -710,3 +711,13 @@ def test_chain_collection_equivalent_to_another_chain_collection():
     collection1 = [chain1, chain3, chain1a]  # chain1 appears twice
     collection2 = [chain1a, chain3a, chain3] # chain3 appears twice
     assert not Chain.are_collections_equivalent(collection1, collection2)
+
+def test_color_is_resolved_when_read():
+    pygame = pytest.importorskip("pygame")
+    c = Chain.from_coord_list([(0, 0), (1, 1)], color=(255, 0, 0))
+    assert c._resolved_color is None
+    assert c.color == pygame.Color(255, 0, 0)
+    c.color = "blue"
+    assert c.color == pygame.Color("blue")
+    _, end = Chain.from_coord_list([(0, 0), (1, 1), (2, 2)], color="green").cut(1)
+    assert end.color == pygame.Color("green")
@@ -0,0 +1,38 @@
+import pytest
+from fixed_timestep import FixedTimestep
+
+
+def test_steps_follow_real_time_not_frames():
+    timestep = FixedTimestep(step_seconds=0.1, substeps=3)
+    calls = []
+    assert timestep.advance(0.05, calls.append) == 0
+    assert timestep.advance(0.06, calls.append) == 1
+    assert calls == pytest.approx([0.1/3] * 3)
+    assert timestep.advance(0.2, calls.append) == 2
+    assert timestep.steps == 3
+    assert len(calls) == 9
+    assert timestep.interpolation == pytest.approx(0.1)
+
+def test_catch_up_is_capped_after_a_stall():
+    timestep = FixedTimestep(step_seconds=0.1, max_catch_up_steps=4)
+    calls = []
+    assert timestep.advance(2.05, calls.append) == 4
+    assert timestep.dropped_steps == 16
+    assert timestep.accumulated_seconds == pytest.approx(0.05)
+    assert timestep.advance(0.06, calls.append) == 1
+
+def test_rendering_is_skipped_while_behind_but_not_forever():
+    timestep = FixedTimestep(step_seconds=0.1, max_catch_up_steps=2, max_skipped_renders=2)
+    renders = []
+    for _ in range(4):
+        timestep.advance(0.5, lambda dt: None)
+        renders.append(timestep.should_render())
+    assert renders == [False, False, True, False]
+    timestep.advance(0.1, lambda dt: None)
+    assert timestep.should_render()
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        FixedTimestep(step_seconds=0)
+    with pytest.raises(ValueError):
+        FixedTimestep(substeps=0)
@@ -0,0 +1,98 @@
+from chain import Chain
+from blob import Blob
+from point import Point
+from half_edge import HalfEdgeGraph
+from blob_test import create_valid_blob_collection
+from world import World
+import simulation
+
+
+def loops_as_sets(chain_loops):
+    return sorted(sorted(id(chain) for chain in chain_loop) for chain_loop in chain_loops)
+
+def assert_matches_full_traversal(graph:HalfEdgeGraph, chains):
+    assert loops_as_sets(graph.chain_loops()) == loops_as_sets(Chain.get_chain_loops_from_chains(chains))
+
+def test_faces_match_full_traversal():
+    _, chains, blobs = create_valid_blob_collection()
+    graph = HalfEdgeGraph.from_chains(chains)
+    assert_matches_full_traversal(graph, chains)
+    assert len(graph.chain_loops()) == len(blobs)
+    assert all(chain.half_edge_graph is graph for chain in chains)
+
+def test_chain_loop_at_reads_a_single_face():
+    _, chains, _ = create_valid_blob_collection()
+    graph = HalfEdgeGraph.from_chains(chains)
+    sides = [graph.chain_loop_at(chains[0], forward) for forward in (True, False)]
+    # c0 separates the faces [7,0,9] and [8,1,0]
+    assert loops_as_sets(sides) == loops_as_sets([[chains[i] for i in [7,0,9]], [chains[i] for i in [8,1,0]]])
+
+def test_faces_follow_cut_and_removal():
+    _, chains, _ = create_valid_blob_collection()
+    graph = HalfEdgeGraph.from_chains(chains)
+    graph.chain_loops()
+    chain_start, chain_end = chains[10].cut(1)
+    chains.append(chain_end)
+    assert chain_end.half_edge_graph is graph
+    assert set(map(id, graph.chains)) == set(map(id, chains))
+    assert_matches_full_traversal(graph, chains)
+    graph.remove_chain(chain_end)
+    chains.remove(chain_end)
+    assert chain_end.half_edge_graph is None
+    assert set(map(id, graph.chains)) == set(map(id, chains))
+    # the top face opened up, chain_start now dangles inside the unbounded face
+    chains.remove(chain_start)
+    assert_matches_full_traversal(graph, chains)
+
+def test_faces_follow_joint_sliding():
+    points, chains, _ = create_valid_blob_collection()
+    graph = HalfEdgeGraph.from_chains(chains)
+    graph.chain_loops()
+    chains[0].switch_endpoint_to(endpoint=points[4], target=points[3])
+    assert_matches_full_traversal(graph, chains)
+    graph.remove_chain(chains[0])
+    assert chains[0].half_edge_graph is None
+    assert_matches_full_traversal(graph, chains[1:])
+
+def test_midpoint_next_to_an_endpoint_resorts_the_vertex():
+    points, chains, _ = create_valid_blob_collection()
+    graph = HalfEdgeGraph.from_chains(chains)
+    graph.chain_loops()
+    chain = next(c for c in chains if c.point_number == 2)
+    start = chain.point_start
+    half_edge = graph.half_edge_of(chain)
+    chain.points.insert(1, start.sibling(*start.co.lerp(chain.point_end.co, 0.5)))
+    chain.mark_topology_changed()
+    graph.chain_loops()
+    assert half_edge.sorted_direction_point is chain.points[1]
+    assert_matches_full_traversal(graph, chains)
+
+def test_faces_follow_a_spoke_swung_past_the_others():
+    j, a, b, c, low = Point(0, 0), Point(10, 0), Point(0, 10), Point(-10, 0), Point(0, -20)
+    chains = [Chain.from_point_list(points) for points in ([j, a], [j, b], [j, c], [a, b], [b, c], [c, low, a])]
+    graph = HalfEdgeGraph.from_chains(chains)
+    assert_matches_full_traversal(graph, chains)
+    #every chain keeps its points, only the angular order around j, a and c changes
+    b.co.update(0, -10)
+    sorted_coordinates = dict(graph._sorted_coordinates)
+    graph.half_edge_of(chains[0])
+    assert graph._sorted_coordinates == sorted_coordinates, "only face walks look at the junctions"
+    assert_matches_full_traversal(graph, chains)
+    assert len(graph.chain_loops()) == 3
+
+def test_world_graph_follows_the_simulation():
+    world = World(goal_blobs_num=4, seed=3)
+    simulation.setup(world)
+    for frame in range(1, 221):
+        simulation.simulate(world, dt=0)
+        if frame % 20 == 0:
+            graph, chains = world.half_edge_graph, world.chains
+            assert set(map(id, graph.chains)) == set(map(id, chains))
+            #a graph built from scratch, the full traversal chokes on faces that touch a vertex twice
+            rebuilt = HalfEdgeGraph.from_chains(chains).chain_loops()
+            for chain in chains:
+                chain.half_edge_graph = graph
+            assert loops_as_sets(graph.chain_loops()) == loops_as_sets(rebuilt)
+    assert len(world.blobs) == 4
+    blobs = Blob.construct_blobs_from_chains(world.chains, world.half_edge_graph)
+    assert loops_as_sets(blob.chain_loop for blob in blobs) == loops_as_sets(world.half_edge_graph.chain_loops())
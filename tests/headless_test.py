@@ -0,0 +1,39 @@
+import sys
+import headless
+import simulation
+import state
+from world import World
+
+
+def test_headless_run_never_opens_a_display():
+    report = headless.run(frames=60)
+    assert report["frames"] == 60
+    assert report["blobs"] == 2 #one spawn every 50 frames
+    pygame = sys.modules.get("pygame")
+    assert pygame is None or not pygame.display.get_init()
+    assert {"link length", "minimal width", "apply"} <= set(report["phase_times"])
+    assert all(seconds >= 0 for seconds in report["phase_times"].values())
+    assert "60 frames" in headless.format_report(report)
+    assert "joint sliding" not in headless.format_report(report), "simulate never slides joints"
+
+def test_headless_run_stops_once_converged():
+    report = headless.run(frames=40, tolerance=1e9, world=World(goal_blobs_num=1))
+    assert report["converged"]
+    assert report["frames"] == 2
+    assert report["world"].frame_count == 2
+    assert state.blobs == [] #the default world is left alone
+
+def test_headless_run_does_not_converge_while_spawning():
+    report = headless.run(frames=40, tolerance=1e9, world=World(goal_blobs_num=2))
+    assert not report["converged"]
+    assert report["frames"] == 40
+
+def test_other_worlds_dont_block_convergence():
+    other = World(seed=1)
+    simulation.setup(other)
+    class ChangingOtherWorld:
+        def record(self, world):
+            other.chains[0].mark_topology_changed()
+    report = headless.run(frames=40, tolerance=1e9, world=World(goal_blobs_num=1), recorder=ChangingOtherWorld())
+    assert report["converged"]
+    assert report["frames"] == 2
@@ -1,4 +1,4 @@
-from pygame.math import Vector2
+from vector import Vector2
 from list_util import rotate_list
 
 
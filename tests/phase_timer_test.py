@@ -0,0 +1,50 @@
+import io
+import json
+import pytest
+from phase_timer import PhaseTimer
+
+
+def fake_frame(timer:PhaseTimer, monkeypatch, durations:dict):
+    clock = [0.0]
+    monkeypatch.setattr("phase_timer.time.perf_counter", lambda: clock[0])
+    for name, seconds in durations.items():
+        with timer.phase(name):
+            clock[0] += seconds
+
+def test_ring_buffer_keeps_the_last_frames(monkeypatch):
+    timer = PhaseTimer(["a", "b"], capacity=3)
+    for frame in range(5):
+        fake_frame(timer, monkeypatch, {"a": frame, "b": 1})
+        timer.end_frame(frame_number=frame * 10)
+    frame_numbers, seconds = timer.recent()
+    assert frame_numbers.tolist() == [20, 30, 40]
+    assert seconds[:, 0].tolist() == [2, 3, 4]
+    assert timer.last() == {"a": 4, "b": 1}
+    assert timer.means() == {"a": 3, "b": 1}
+    assert timer.means(last_frames=2) == {"a": 3.5, "b": 1}
+    assert timer.totals() == {"a": 10, "b": 5}
+
+def test_repeated_phases_add_up(monkeypatch):
+    timer = PhaseTimer(["a", "b"])
+    fake_frame(timer, monkeypatch, {"a": 0.5})
+    fake_frame(timer, monkeypatch, {"a": 0.25})
+    timer.end_frame()
+    assert timer.last() == {"a": 0.75, "b": 0}
+    with pytest.raises(KeyError):
+        timer.phase("c")
+
+def test_json_lines_and_overlay(monkeypatch):
+    timer = PhaseTimer(["a", "b"])
+    fake_frame(timer, monkeypatch, {"a": 0.001, "b": 0.002})
+    timer.end_frame(frame_number=7)
+    file = io.StringIO()
+    timer.dump_json_lines(file)
+    records = [json.loads(line) for line in file.getvalue().splitlines()]
+    assert records == [{"frame": 7, "phases": {"a": 0.001, "b": 0.002}, "total": pytest.approx(0.003)}]
+    lines = timer.overlay_lines()
+    assert len(lines) == 3 and "2.00 ms" in lines[1]
+    fake_frame(timer, monkeypatch, {"a": 0.001})
+    timer.end_frame()
+    assert [line.split()[0] for line in timer.overlay_lines(last_frames=1)] == ["a", "total"]
+    timer.reset()
+    assert timer.recent()[1].shape == (0, 2)
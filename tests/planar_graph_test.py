@@ -0,0 +1,44 @@
+import math
+import numpy as np
+import pytest
+from vector import Vector2
+from point import Point
+from planar_graph import compute_angle, get_faces_of_planar_graph, pseudo_angles
+
+
+def create_grid_edges(cells:int):
+    points = [[Point(x, y) for y in range(cells + 1)] for x in range(cells + 1)]
+    edges = []
+    for x in range(cells + 1):
+        for y in range(cells + 1):
+            if x < cells:
+                edges.append((points[x][y], points[x+1][y]))
+            if y < cells:
+                edges.append((points[x][y+1], points[x][y]))
+    return points, edges
+
+def test_pseudo_angle_sorts_like_angle():
+    directions = [Vector2(math.cos(t), math.sin(t)) for t in [i * math.tau / 48 for i in range(48)]]
+    directions += [Vector2(1, 0), Vector2(-1, 0), Vector2(0, -2), Vector2(-3, -0.0)]
+    by_angle = sorted(directions, key=lambda d: compute_angle(Vector2(0, 0), d))
+    angles = pseudo_angles(np.array([d.x for d in directions]), np.array([d.y for d in directions]))
+    by_pseudo_angle = [directions[i] for i in np.argsort(angles, kind="stable")]
+    assert [tuple(d) for d in by_angle] == pytest.approx([tuple(d) for d in by_pseudo_angle])
+
+def test_grid_faces():
+    cells = 6
+    points, edges = create_grid_edges(cells)
+    faces = get_faces_of_planar_graph(edges)
+    assert len(faces) == cells * cells
+    assert all(len(face) == 4 for face in faces)
+    corner_face = [face for face in faces if points[0][0] in face]
+    assert len(corner_face) == 1
+    assert set(corner_face[0]) == {points[0][0], points[1][0], points[1][1], points[0][1]}
+
+def test_no_edges():
+    assert get_faces_of_planar_graph([]) == []
+
+def test_pseudo_angles_of_the_axes():
+    dxs = np.array([1, 0, -1, 0, 2, -0.0, 0])
+    dys = np.array([0, 1, 0, -1, -2, -1, 0])
+    assert pseudo_angles(dxs, dys) == pytest.approx([0, 1, 2, 3, 3.5, 3, 0])
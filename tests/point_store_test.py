@@ -0,0 +1,92 @@
+from vector import Vector2
+import numpy as np
+import pytest
+from point import Point
+from chain import Chain
+from point_store import PointStore, StoredPoint
+from blob import Blob
+from blob_test import create_valid_blob
+from benchmarks.worlds import create_grid_world
+
+
+def test_stored_point_behaves_like_point():
+    store = PointStore()
+    p = store.create_point(3, 4)
+    assert p.co == Vector2(3, 4)
+    assert p.offset == Vector2(0, 0)
+    p.add_offset(1, 2, multiplier=2)
+    assert p.offset == Vector2(2, 4)
+    assert tuple(store.offset[p.index]) == (2, 4)
+    p.apply_accumulated_offset()
+    assert p.co == Vector2(5, 8)
+    assert p.offset == Vector2(0, 0)
+    p.add_offset(3, 4)
+    p.clamp_offset(1)
+    assert p.offset.length() == pytest.approx(1)
+
+def test_store_grows_and_reuses_rows():
+    store = PointStore(capacity=2)
+    points = [store.create_point(i, -i) for i in range(5)]
+    assert store.capacity >= 5
+    for i, p in enumerate(points):
+        assert p.co == Vector2(i, -i)
+    store.release(points[1].index)
+    assert store.point_number == 4
+    reused = store.create_point(10, 10)
+    assert reused.index == points[1].index
+    store.release(points[2].index)
+    with pytest.raises(ValueError):
+        store.release(points[2].index)
+
+def test_new_points_inherit_the_store():
+    store = PointStore()
+    start, end = store.create_point(0, 0), store.create_point(10, 0)
+    chain = Chain.from_end_points(start, end, point_num=5)
+    assert all(isinstance(p, StoredPoint) and p.store is store for p in chain.points)
+    midpoint = chain.create_midpoint(0, 1)
+    assert isinstance(midpoint, StoredPoint)
+    assert midpoint.co == Vector2(1.25, 0)
+    new_point = Point.from_point_and_offset(start, Vector2(0, 1))
+    assert isinstance(new_point, StoredPoint)
+
+def test_adopt_existing_blob():
+    blob = create_valid_blob()
+    original_coordinates = [p.co.copy() for p in blob.points_list]
+    store = PointStore()
+    store.adopt(blob.points_list)
+    assert all(isinstance(p, StoredPoint) for p in blob.points_list)
+    assert [p.co for p in blob.points_list] == original_coordinates
+    blob.assert_is_valid()
+    assert blob.calculate_area() == pytest.approx(100*100)
+
+    for chain in blob.chain_loop:
+        chain.enforce_link_length(1, ignore_umoving_status=True)
+    indexes = store.indexes_of(blob.points_list)
+    assert np.any(store.offset[indexes] != 0)
+    store.apply_offsets(indexes)
+    assert np.all(store.offset[indexes] == 0)
+
+def test_in_place_changes_reach_the_store():
+    store = PointStore(capacity=1)
+    p = store.create_point(1, 2)
+    p.offset.update(3, 4)
+    p.co += (1, 1)
+    assert tuple(store.offset[p.index]) == (3, 4)
+    assert tuple(store.co[p.index]) == (2, 3)
+    co = p.co
+    store.create_point(0, 0) #grows the store
+    co.x = 7
+    assert p.co == Vector2(7, 3) and isinstance(co, Vector2)
+
+def test_chains_and_blobs_work_on_adopted_points():
+    blobs = create_grid_world(4, link_length=10)
+    chains = list({id(chain): chain for blob in blobs for chain in blob.chain_loop}.values())
+    store = PointStore()
+    store.adopt(p for chain in chains for p in chain.points)
+    rebuilt = Blob.construct_blobs_from_chains(chains)
+    assert sorted(round(blob.calculate_area()) for blob in rebuilt) == sorted(round(blob.calculate_area()) for blob in blobs)
+    chain = chains[0]
+    cut_point = chain.points[2]
+    assert isinstance(cut_point, StoredPoint)
+    start, end = chain.cut(cut_point)
+    assert start.point_end is cut_point and end.point_start is cut_point
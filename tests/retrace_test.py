@@ -196,3 +196,16 @@ def test_reconstruct_blobs_when_they_all_share_two_points():
         assert abs(i1 - i2) == 1
     
 
+
+def test_retracing_stacked_blobs_with_identical_coordinates():
+    #the points of the two squares print the same, but they are distinct objects
+    square_chain_lists = []
+    for _ in range(2):
+        corners = [Point(0, 0), Point(0, 10), Point(10, 10), Point(10, 0)]
+        square_chain_lists.append([Chain.from_end_points(a, b, point_num=4) for a, b in zip(corners, corners[1:] + corners[:1])])
+    chains = square_chain_lists[0] + square_chain_lists[1]
+    chain_loops = Chain.get_chain_loops_from_chains(chains)
+    assert len(chain_loops) == 2
+    found = sorted(sorted(id(c) for c in chain_loop) for chain_loop in chain_loops)
+    expected = sorted(sorted(id(c) for c in square_chains) for square_chains in square_chain_lists)
+    assert found == expected
@@ -1,5 +1,7 @@
 from point import Point
 from chain import Chain
+from world import World
+import simulation
 
 
 def test_point_chains_references_management():
@@ -48,4 +50,17 @@ def test_point_chains_references_management():
     chain2a, chain2b = chain2.cut(1)
     chains.append(chain2b)
     assert chain2a in chains
-    assert_chains_are_valid()
\ No newline at end of file
+    assert_chains_are_valid()
+def test_only_the_frame_chains_hold_still():
+    world = World(goal_blobs_num=2, seed=0)
+    simulation.setup(world)
+    frame_chains = list(world.blobs[0].chain_loop)
+    assert all(chain.is_unmoving for chain in frame_chains)
+    for _ in range(50):
+        simulation.simulate(world, dt=0)
+    assert len(world.blobs) == 2
+    spawned_chains = [chain for chain in world.blobs[1].chain_loop if not chain.is_unmoving]
+    assert len(spawned_chains) == 1 #the new chain, the cut pieces of the frame keep holding still
+    one_sided = Chain.from_coord_list([(0, 0), (1, 0), (2, 0)])
+    one_sided.set_blobs(left=world.blobs[0])
+    assert not one_sided.is_unmoving
@@ -0,0 +1,47 @@
+import numpy as np
+import simulation
+import snapshot
+from benchmarks.worlds import create_grid_world, install_world
+from world import World
+
+
+def coordinates(world:World):
+    return [(point.co.x, point.co.y) for chain in world.chains for point in chain.points]
+
+def test_snapshot_round_trip(tmp_path):
+    world = World(goal_blobs_num=3, seed=5)
+    simulation.setup(world)
+    for _ in range(120):
+        simulation.simulate(world, dt=0)
+    path = tmp_path / "world.npz"
+    snapshot.save(world, path)
+    loaded = snapshot.load(path)
+    assert loaded.frame_count == 120 and loaded.seed == 5
+    assert coordinates(loaded) == coordinates(world)
+    assert [blob.calculate_area() for blob in loaded.blobs] == [blob.calculate_area() for blob in world.blobs]
+    assert [blob.link_length for blob in loaded.blobs] == [blob.link_length for blob in world.blobs]
+    assert [(c.is_unmoving, c.blob_left is None, c.blob_right is None) for c in loaded.chains] == \
+        [(c.is_unmoving, c.blob_left is None, c.blob_right is None) for c in world.chains]
+    for blob in loaded.blobs:
+        blob.assert_is_valid()
+    assert loaded.rng.random() == world.rng.random()
+
+def test_snapshot_shares_joints_between_chains(tmp_path):
+    world = install_world(create_grid_world(4, link_length=10), link_length=10)
+    arrays = snapshot.to_arrays(world)
+    assert len(arrays["co"]) == len({id(p) for chain in world.chains for p in chain.points})
+    assert np.all(np.diff(arrays["chain_offsets"]) >= 2)
+    path = tmp_path / "grid.npz"
+    snapshot.save(world, path, compressed=True)
+    loaded = snapshot.load(path)
+    joints = [p for chain in loaded.chains for p in (chain.point_start, chain.point_end)]
+    assert len({id(p) for p in joints}) == 9
+    assert [blob.is_chain_backwards(chain_index=i) for blob in loaded.blobs for i in range(4)] == arrays["loop_backwards"].tolist()
+    simulation.simulate(loaded, dt=0)
+
+def test_unknown_link_lengths_stay_unknown(tmp_path, capsys):
+    world = install_world(create_grid_world(2, link_length=10), link_length=10)
+    world.blobs[1].link_length = 0
+    loaded = snapshot.from_arrays(snapshot.to_arrays(world))
+    assert [blob.known_link_length for blob in loaded.blobs] == [10, None]
+    assert capsys.readouterr().out == "" #nothing was calculated on the fly
@@ -0,0 +1,30 @@
+import math
+import random
+import numpy as np
+from spatial_grid import close_pairs
+
+
+def brute_force_close_pairs(coordinates, radius):
+    pairs = set()
+    for i in range(len(coordinates)):
+        for j in range(i+1, len(coordinates)):
+            if math.dist(coordinates[i], coordinates[j]) <= radius:
+                pairs.add((i, j))
+    return pairs
+
+def test_close_pairs_matches_brute_force():
+    rng = random.Random(3)
+    coordinates = np.array([(rng.uniform(-50, 50), rng.uniform(-20, 80)) for _ in range(300)])
+    for radius in [0.5, 4, 13.3, 200]:
+        a, b, distances = close_pairs(coordinates, radius)
+        assert set(zip(a.tolist(), b.tolist())) == brute_force_close_pairs(coordinates, radius)
+        assert len(set(zip(a.tolist(), b.tolist()))) == len(a), "pairs should be reported once"
+        assert np.all(a < b)
+        assert np.allclose(distances, np.hypot(*(coordinates[a] - coordinates[b]).T))
+
+def test_close_pairs_degenerate_input():
+    a, b, distances = close_pairs(np.zeros((1, 2)), 1)
+    assert len(a) == len(b) == len(distances) == 0
+    a, b, distances = close_pairs(np.zeros((3, 2)), 1)
+    assert len(a) == 3
+    assert np.all(distances == 0)
@@ -0,0 +1,32 @@
+import csv
+import state
+import sweep
+
+
+def test_parameter_grid():
+    grid = sweep.parameter_grid({"resolution": [4, 5], "goal_blobs_num": [3, 6], "min_thinkness": None})
+    assert grid == [
+        {"resolution": 4, "goal_blobs_num": 3},
+        {"resolution": 4, "goal_blobs_num": 6},
+        {"resolution": 5, "goal_blobs_num": 3},
+        {"resolution": 5, "goal_blobs_num": 6},
+    ]
+    assert sweep.parameter_grid({}) == [{}]
+
+def test_sweep_in_a_process_pool_is_deterministic(tmp_path):
+    parameter_sets = sweep.parameter_grid({"resolution": [6.0], "goal_blobs_num": [2, 3]})
+    rows = sweep.sweep(parameter_sets, frames=55, seed=7, workers=2)
+    assert [(row["goal_blobs_num"], row["seed"], row["frames"], row["blobs"]) for row in rows] == [(2, 7, 55, 2), (3, 8, 55, 2)]
+    assert all(row["area_variance"] > 0 and row["mean_frame_seconds"] > 0 for row in rows)
+    again = sweep.sweep(parameter_sets, frames=55, seed=7, workers=1)
+    assert [row["area_variance"] for row in again] == [row["area_variance"] for row in rows]
+    assert state.blobs == []
+    path = tmp_path / "sweep.csv"
+    sweep.write_csv(rows, str(path))
+    with open(path) as file:
+        assert [row["goal_blobs_num"] for row in csv.DictReader(file)] == ["2", "3"]
+    assert "area_variance" in sweep.format_table(rows)
+
+def test_sweep_checks_convergence_by_default():
+    row, = sweep.sweep([{"goal_blobs_num": 1}], frames=40, workers=1)
+    assert row["converged"] and row["frames"] == 2
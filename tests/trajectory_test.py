@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+import simulation
+from snapshot import coordinates_of, number_points
+from trajectory import TrajectoryReader, TrajectoryRecorder
+from world import World
+
+
+def test_trajectory_round_trip_across_topology_changes(tmp_path):
+    path = tmp_path / "run.trj"
+    world = World(goal_blobs_num=3, seed=2)
+    simulation.setup(world)
+    expected = dict()
+    with TrajectoryRecorder(path, every=2, initial_data_bytes=64) as recorder:
+        for _ in range(110):
+            simulation.simulate(world, dt=0)
+            if recorder.record(world):
+                points, chain_points, chain_offsets = number_points(world.chains)
+                expected[world.frame_count] = (coordinates_of(points), chain_points, chain_offsets)
+    reader = TrajectoryReader(path)
+    assert len(reader) == 55
+    assert reader.frame_numbers.tolist() == list(range(2, 111, 2))
+    assert len(reader.topology_changes()) > 2 #the first frame, the spawns and the midpoints
+    for i, frame in enumerate(reader.frame_numbers.tolist()):
+        coordinates, chain_points, chain_offsets = expected[frame]
+        np.testing.assert_array_equal(reader.coordinates(i), coordinates)
+        recorded_points, recorded_offsets = reader.topology(i)
+        np.testing.assert_array_equal(recorded_points, chain_points)
+        np.testing.assert_array_equal(recorded_offsets, chain_offsets)
+    assert len(reader.coordinates(0)) != len(reader.coordinates(len(reader) - 1))
+
+def test_trajectory_index_capacity(tmp_path):
+    world = World(seed=0)
+    simulation.setup(world)
+    recorder = TrajectoryRecorder(tmp_path / "small.trj", index_capacity=2)
+    recorder.record(world)
+    with pytest.raises(ValueError):
+        recorder.record(world)
+    recorder.close()
+    assert len(TrajectoryReader(tmp_path / "small.trj")) == 1
+
+def test_other_worlds_dont_add_topology_records(tmp_path):
+    world, other = World(seed=0), World(seed=1)
+    simulation.setup(world)
+    simulation.setup(other)
+    with TrajectoryRecorder(tmp_path / "quiet.trj") as recorder:
+        for _ in range(5):
+            recorder.record(world)
+            other.chains[0].mark_topology_changed()
+    reader = TrajectoryReader(tmp_path / "quiet.trj")
+    assert len(reader) == 5
+    assert len(reader.topology_changes()) == 1
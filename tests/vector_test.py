@@ -0,0 +1,35 @@
+import math
+import pytest
+from vector import Vector2
+
+
+def test_matches_pygame_vector():
+    pygame = pytest.importorskip("pygame")
+    pairs = [(Vector2(3, -4), pygame.Vector2(3, -4)), (Vector2(0.5, 2), pygame.Vector2(0.5, 2))]
+    for ours, theirs in pairs:
+        assert ours == theirs and theirs == ours
+        assert str(ours) == str(theirs)
+        assert ours.length() == pytest.approx(theirs.length())
+        assert ours.distance_to((1, 1)) == pytest.approx(theirs.distance_to((1, 1)))
+        assert ours * Vector2(2, 5) == pytest.approx(theirs * pygame.Vector2(2, 5))
+        assert ours.cross((2, 5)) == pytest.approx(theirs.cross((2, 5)))
+        for degrees in [90, -90, 180, 30]:
+            assert ours.rotate(degrees) == theirs.rotate(degrees)
+        assert ours.lerp((7, 7), 0.25) == theirs.lerp((7, 7), 0.25)
+        assert ours.normalize() == theirs.normalize()
+        ours.scale_to_length(2)
+        theirs.scale_to_length(2)
+        assert ours == theirs
+
+def test_in_place_operators_mutate():
+    v = Vector2(1, 2)
+    alias = v
+    v += (1, 1)
+    v *= 2
+    assert alias is v and alias == (4, 6)
+    assert Vector2(5) == (5, 5)
+    with pytest.raises(ValueError):
+        Vector2(0, 0).scale_to_length(1)
+    with pytest.raises(TypeError):
+        hash(Vector2(1, 1))
+    assert math.isclose(Vector2(1, 0).rotate(45).y, math.sqrt(0.5))
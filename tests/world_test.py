@@ -0,0 +1,47 @@
+import simulation
+import state
+from world import World
+
+
+def test_worlds_are_stepped_independently():
+    small, large = World(width=300, height=200), World()
+    simulation.setup(small)
+    simulation.setup(large)
+    for _ in range(50):
+        simulation.simulate(small, dt=0)
+    simulation.simulate(large, dt=0)
+    assert (small.frame_count, large.frame_count) == (50, 1)
+    assert (len(small.blobs), len(large.blobs)) == (2, 1)
+    assert small.timer.frame_count == 50 and large.timer.frame_count == 1
+    assert small.resolution == 2 and large.resolution == state.resolution
+    assert not set(map(id, small.chains)) & set(map(id, large.chains))
+    assert state.blobs == []
+    small.reset()
+    assert small.blobs == [] and small.frame_count == 0 and small.chain_batch is None
+
+def test_default_world_shares_state_blobs():
+    assert simulation.default_world.blobs is state.blobs
+    assert simulation.default_world.goal_blob_point_number == state.goal_blob_point_number
+    simulation.setup()
+    try:
+        simulation.simulate(dt=0)
+        assert len(state.blobs) == 1
+        assert simulation.default_world.frame_count == 1
+    finally:
+        simulation.reset()
+    assert state.blobs == []
+
+def final_coordinates(world:World, frames:int):
+    simulation.setup(world)
+    for _ in range(frames):
+        simulation.simulate(world, dt=0)
+    return sorted((point.co.x, point.co.y) for chain in world.chains for point in chain.points)
+
+def test_worlds_of_the_same_seed_replay_the_same_events():
+    first, second = World(goal_blobs_num=3, seed=11), World(goal_blobs_num=3, seed=11)
+    coordinates = final_coordinates(first, 101)
+    assert len(first.blobs) == 3
+    assert final_coordinates(second, 101) == coordinates
+    first.reset()
+    assert final_coordinates(first, 101) == coordinates
+    assert final_coordinates(World(goal_blobs_num=3, seed=12), 101) != coordinates
@@ -0,0 +1,146 @@
+"""Records the point coordinates of a running world into a memory-mapped file, for offline analysis and replay.
+
+layout of a trajectory file:
+    header      64 bytes: magic, format version, index capacity, entry count, data start, data end (little endian uint64)
+    index       index capacity entries of (kind, frame, data offset, length) int64
+    data        the float64 coordinates of the frames and the int64 topology records, back to back
+
+A frame entry holds length/2 points, numbered the way snapshot.number_points numbers them.
+The points only keep their numbers until the topology changes, so whenever it does (a midpoint, a removed point, a spawned blob...)
+a topology entry comes before the next frame: [chain number, chain offsets..., chain points...], see snapshot.
+A frame belongs to the last topology entry before it.
+
+Appending copies the coordinates into the mapping, the operating system writes them out whenever it likes, so the simulation doesn't wait for the disk.
+The data region doubles whenever it runs out, the file is sparse until it is written.
+The header counts an entry only once its data is written, so the file of a crashed run is readable up to its last complete entry."""
+import mmap
+import struct
+from typing import List, Tuple
+import numpy as np
+from point import Point
+from snapshot import coordinates_of, number_points
+from world import World
+
+MAGIC = b"BLOBTRJ\0"
+FORMAT_VERSION = 1
+HEADER_SIZE = 64
+_HEADER = struct.Struct("<8s5Q")
+ENTRY_SIZE = 4 * 8
+FRAME, TOPOLOGY = 0, 1
+
+
+class TrajectoryRecorder:
+    """Appends every `every`-th frame of a world to the file at path, which it creates or truncates.
+    Call record(world) after each simulate and close() at the end, or use it as a context manager."""
+    def __init__(self, path, every:int = 1, index_capacity:int = 1 << 20, initial_data_bytes:int = 1 << 24) -> None:
+        if every < 1 or index_capacity < 1:
+            raise ValueError("every and index_capacity have to be positive", every, index_capacity)
+        self.path = path
+        self.every = every
+        self.index_capacity = index_capacity
+        self.data_start = HEADER_SIZE + index_capacity * ENTRY_SIZE
+        self.entry_count = 0
+        self.data_end = 0 #bytes of the data region in use
+        self._file = open(path, "w+b")
+        self._size = self.data_start + max(initial_data_bytes, 1)
+        self._file.truncate(self._size)
+        self._map = mmap.mmap(self._file.fileno(), self._size)
+        self._write_header()
+
+    _topology_key:tuple = None
+    _points:List[Point] = []
+
+    def __enter__(self)->"TrajectoryRecorder":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+    def record(self, world:World)->bool:
+        """appends the current coordinates if the frame is due, returns whether it did"""
+        if world.frame_count % self.every != 0:
+            return False
+        #only the world's own blobs and chains count, other worlds stepped in the same process don't change the numbering
+        topology_key = tuple((id(blob), blob.topology_version) for blob in world.blobs)
+        if topology_key != self._topology_key:
+            self._points, chain_points, chain_offsets = number_points(world.chains)
+            self._append(TOPOLOGY, world.frame_count, np.concatenate(([len(chain_offsets) - 1], chain_offsets, chain_points)).astype(np.int64))
+            self._topology_key = topology_key
+        self._append(FRAME, world.frame_count, coordinates_of(self._points).ravel())
+        return True
+
+    def _append(self, kind:int, frame:int, values:np.ndarray):
+        if self.entry_count >= self.index_capacity:
+            raise ValueError("The index of the trajectory is full, create the recorder with a larger index_capacity", self.index_capacity)
+        nbytes = values.nbytes
+        needed = self.data_start + self.data_end + nbytes
+        if needed > self._size:
+            self._grow(needed)
+        start = self.data_start + self.data_end
+        self._map[start:start + nbytes] = memoryview(np.ascontiguousarray(values)).cast("B")
+        entry = HEADER_SIZE + self.entry_count * ENTRY_SIZE
+        self._map[entry:entry + ENTRY_SIZE] = struct.pack("<4q", kind, frame, self.data_end, len(values))
+        self.data_end += nbytes
+        self.entry_count += 1
+        self._write_header()
+
+    def _grow(self, needed:int):
+        size = self._size
+        while size < needed:
+            size = self.data_start + 2 * (size - self.data_start)
+        self._map.close()
+        self._file.truncate(size)
+        self._size = size
+        self._map = mmap.mmap(self._file.fileno(), size)
+
+    def _write_header(self):
+        self._map[:_HEADER.size] = _HEADER.pack(MAGIC, FORMAT_VERSION, self.index_capacity, self.entry_count, self.data_start, self.data_end)
+
+    def close(self):
+        """flushes the mapping and trims the unused tail of the data region"""
+        if self._map.closed:
+            return
+        self._map.flush()
+        self._map.close()
+        self._file.truncate(self.data_start + self.data_end)
+        self._file.close()
+
+
+class TrajectoryReader:
+    """Memory maps a recorded trajectory, the coordinates it returns are read only views into the file"""
+    def __init__(self, path) -> None:
+        self._data = np.memmap(path, dtype=np.uint8, mode="r")
+        magic, version, index_capacity, entry_count, data_start, data_end = _HEADER.unpack(self._data[:_HEADER.size].tobytes())
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Not a trajectory of a supported format version", path, magic, version)
+        self.index = self._data[HEADER_SIZE:HEADER_SIZE + entry_count * ENTRY_SIZE].view(np.int64).reshape(-1, 4)
+        self.data_start = data_start
+        frames = self.index[:, 0] == FRAME
+        self._frame_entries = np.flatnonzero(frames)
+        self._topology_entries = np.flatnonzero(~frames)
+        self.frame_numbers = self.index[self._frame_entries, 1]
+
+    def __len__(self)->int:
+        return len(self._frame_entries)
+
+    def _values(self, entry:int, dtype)->np.ndarray:
+        _, _, offset, length = self.index[entry].tolist()
+        start = self.data_start + offset
+        return self._data[start:start + length * 8].view(dtype)
+
+    def coordinates(self, i:int)->np.ndarray:
+        """(points, 2) coordinates of the i-th recorded frame"""
+        return self._values(self._frame_entries[i], np.float64).reshape(-1, 2)
+
+    def topology(self, i:int)->Tuple[np.ndarray, np.ndarray]:
+        """the chain points and chain offsets the points of the i-th recorded frame are numbered by"""
+        entry = self._frame_entries[i]
+        topology_entry = self._topology_entries[np.searchsorted(self._topology_entries, entry) - 1]
+        values = self._values(topology_entry, np.int64)
+        chain_number = int(values[0])
+        return values[chain_number + 2:], values[1:chain_number + 2]
+
+    def topology_changes(self)->np.ndarray:
+        """frame numbers at which the points were numbered anew"""
+        return self.index[self._topology_entries, 1]
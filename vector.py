@@ -0,0 +1,197 @@
+"""A pure python stand in for pygame.math.Vector2, covering the part of its API the geometry core uses.
+Importing pygame.math runs the pygame package init, which loads the display, the mixer, the fonts...
+The core only needs 2d arithmetic, so it uses this class and imports without pygame.
+The semantics follow pygame: in place operators mutate, v*w is the dot product,
+comparisons tolerate a difference of epsilon per component, and a vector compares equal to any sequence of two numbers."""
+import math
+from typing import Iterator, Sequence, Union
+
+_VectorLike = Union["Vector2", Sequence[float]]
+
+
+class Vector2:
+    __slots__ = ("x", "y")
+    epsilon = 1e-6
+
+    def __init__(self, x:Union[float, _VectorLike] = 0.0, y:float = None) -> None:
+        if y is None:
+            if not hasattr(x, "__len__"): #a number, numpy scalars included
+                self.x = self.y = float(x)
+                return
+            x, y = x
+        self.x = float(x)
+        self.y = float(y)
+
+    def __str__(self) -> str:
+        return f"[{self.x:g}, {self.y:g}]"
+
+    def __repr__(self) -> str:
+        return f"<Vector2({self.x:g}, {self.y:g})>"
+
+    def __len__(self) -> int:
+        return 2
+
+    def __iter__(self) -> Iterator[float]:
+        yield self.x
+        yield self.y
+
+    def __getitem__(self, index:int) -> float:
+        return (self.x, self.y)[index]
+
+    def __setitem__(self, index:int, value:float):
+        if index in (0, -2):
+            self.x = float(value)
+        elif index in (1, -1):
+            self.y = float(value)
+        else:
+            raise IndexError("Vector2 index out of range", index)
+
+    def __eq__(self, other) -> bool:
+        try:
+            ox, oy = other
+        except (TypeError, ValueError):
+            return NotImplemented
+        return abs(self.x - ox) < self.epsilon and abs(self.y - oy) < self.epsilon
+
+    def __ne__(self, other) -> bool:
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None #mutable, like the pygame vectors
+
+    def __bool__(self) -> bool:
+        return self.x != 0 or self.y != 0
+
+    def __neg__(self) -> "Vector2":
+        return Vector2(-self.x, -self.y)
+
+    def __pos__(self) -> "Vector2":
+        return Vector2(self.x, self.y)
+
+    def __add__(self, other:_VectorLike) -> "Vector2":
+        ox, oy = other
+        return Vector2(self.x + ox, self.y + oy)
+
+    __radd__ = __add__
+
+    def __sub__(self, other:_VectorLike) -> "Vector2":
+        ox, oy = other
+        return Vector2(self.x - ox, self.y - oy)
+
+    def __rsub__(self, other:_VectorLike) -> "Vector2":
+        ox, oy = other
+        return Vector2(ox - self.x, oy - self.y)
+
+    def __mul__(self, other:Union[float, _VectorLike]):
+        if hasattr(other, "__len__"):
+            return self.dot(other)
+        return Vector2(self.x * other, self.y * other)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, scalar:float) -> "Vector2":
+        return Vector2(self.x / scalar, self.y / scalar)
+
+    def __floordiv__(self, scalar:float) -> "Vector2":
+        return Vector2(self.x // scalar, self.y // scalar)
+
+    def __iadd__(self, other:_VectorLike) -> "Vector2":
+        ox, oy = other
+        self.x += ox
+        self.y += oy
+        return self
+
+    def __isub__(self, other:_VectorLike) -> "Vector2":
+        ox, oy = other
+        self.x -= ox
+        self.y -= oy
+        return self
+
+    def __imul__(self, scalar:float) -> "Vector2":
+        self.x *= scalar
+        self.y *= scalar
+        return self
+
+    def __itruediv__(self, scalar:float) -> "Vector2":
+        self.x /= scalar
+        self.y /= scalar
+        return self
+
+    @property
+    def xy(self) -> "Vector2":
+        return Vector2(self.x, self.y)
+
+    def copy(self) -> "Vector2":
+        return Vector2(self.x, self.y)
+
+    def update(self, x:Union[float, _VectorLike] = 0.0, y:float = None):
+        if y is None:
+            if not hasattr(x, "__len__"): #a number, numpy scalars included
+                self.x = self.y = float(x)
+                return
+            x, y = x
+        self.x = float(x)
+        self.y = float(y)
+
+    def dot(self, other:_VectorLike) -> float:
+        ox, oy = other
+        return self.x * ox + self.y * oy
+
+    def cross(self, other:_VectorLike) -> float:
+        ox, oy = other
+        return self.x * oy - self.y * ox
+
+    def length(self) -> float:
+        return math.hypot(self.x, self.y)
+
+    magnitude = length
+
+    def length_squared(self) -> float:
+        return self.x * self.x + self.y * self.y
+
+    magnitude_squared = length_squared
+
+    def distance_to(self, other:_VectorLike) -> float:
+        ox, oy = other
+        return math.hypot(self.x - ox, self.y - oy)
+
+    def distance_squared_to(self, other:_VectorLike) -> float:
+        ox, oy = other
+        dx, dy = self.x - ox, self.y - oy
+        return dx * dx + dy * dy
+
+    def normalize(self) -> "Vector2":
+        length = self.length()
+        if length == 0:
+            raise ValueError("Can't normalize Vector of length Zero")
+        return Vector2(self.x / length, self.y / length)
+
+    def normalize_ip(self):
+        length = self.length()
+        if length == 0:
+            raise ValueError("Can't normalize Vector of length Zero")
+        self.x /= length
+        self.y /= length
+
+    def scale_to_length(self, length:float):
+        current = self.length()
+        if current == 0:
+            raise ValueError("Cannot scale a vector with zero length")
+        factor = length / current
+        self.x *= factor
+        self.y *= factor
+
+    def rotate(self, degrees:float) -> "Vector2":
+        """counterclockwise in a y up frame, multiples of 90 degrees are exact"""
+        quarter_turns, remainder = divmod(degrees, 90)
+        if remainder == 0:
+            return (Vector2(self.x, self.y), Vector2(-self.y, self.x), Vector2(-self.x, -self.y), Vector2(self.y, -self.x))[int(quarter_turns) % 4]
+        radians = math.radians(degrees)
+        c, s = math.cos(radians), math.sin(radians)
+        return Vector2(self.x * c - self.y * s, self.x * s + self.y * c)
+
+    def lerp(self, other:_VectorLike, t:float) -> "Vector2":
+        if not 0 <= t <= 1:
+            raise ValueError("Argument 2 must be in range [0, 1]", t)
+        ox, oy = other
+        return Vector2(self.x + (ox - self.x) * t, self.y + (oy - self.y) * t)
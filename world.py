@@ -0,0 +1,87 @@
+import math
+import random
+from typing import List, Optional
+import state
+from blob import Blob
+from chain import Chain
+from chain_batch import ChainBatch
+from half_edge import HalfEdgeGraph
+from phase_timer import PhaseTimer
+from point import Point
+
+SIMULATION_PHASES = [
+    "spawning",
+    "link length",
+    "secondary distance",
+    "area equalization",
+    "minimal width",
+    "circumference",
+    "clamp",
+    "apply",
+    "joint sliding",
+]
+
+
+class World:
+    """Everything one simulation owns: its blobs, its parameters, the caches reused between frames and its timer.
+    Several worlds can be stepped side by side in one process, none of them touches the module globals of state.
+    Unset parameters are derived from the size the same way state does it.
+    Every random choice of the simulation is drawn from rng, so worlds of the same seed replay the same events.
+    Without a seed the operating system seeds it."""
+    def __init__(self, width:float = 720, height:float = 480, resolution:Optional[float] = None,
+                 link_length:Optional[float] = None, min_thinkness:Optional[float] = None, goal_blobs_num:int = 10,
+                 goal_blob_point_number:Optional[int] = None, seed:Optional[int] = None) -> None:
+        self.width = width
+        self.height = height
+        lesser_dimention = min(width, height)
+        self.resolution = lesser_dimention/100 if resolution is None else resolution
+        self.link_length = self.resolution if link_length is None else link_length
+        self.min_thinkness = lesser_dimention/10 if min_thinkness is None else min_thinkness
+        self.goal_blobs_num = goal_blobs_num
+        self.goal_blob_point_number_override = goal_blob_point_number
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.blobs:List[Blob] = list()
+        self.timer = PhaseTimer(SIMULATION_PHASES) #per frame timings of the last frames
+
+    frame_count = 0
+    point_of_interest:Point = None
+    chain_batch:ChainBatch = None #reused between frames until the topology of the movable chains changes
+    half_edge_graph:HalfEdgeGraph = None #the faces between the chains, the chains keep it up to date as they change
+
+    @classmethod
+    def from_state(cls)->"World":
+        """the world of the module globals in state, it shares the state.blobs list"""
+        world = cls(width=state.width, height=state.height, resolution=state.resolution,
+                    link_length=state.link_length, min_thinkness=state.min_thinkness, goal_blobs_num=state.goal_blobs_num,
+                    seed=state.seed)
+        world.blobs = state.blobs
+        return world
+
+    @property
+    def expected_blob_area(self)->float:
+        return self.width * self.height / self.goal_blobs_num
+
+    @property
+    def goal_blob_point_number(self)->int:
+        if self.goal_blob_point_number_override is not None:
+            return self.goal_blob_point_number_override
+        square_cirumference = math.sqrt(self.expected_blob_area)*4
+        goal_blob_circumference = square_cirumference * 1.5
+        return math.ceil(goal_blob_circumference/self.link_length)
+
+    @property
+    def chains(self)->List[Chain]:
+        """derived from the blobs on every access, there is no list of chains to keep up to date"""
+        return state.get_chains_list(self.blobs)
+
+    def reset(self):
+        """forgets the blobs, so that setup can build a new world in their place.
+        The rng starts over from the seed, so the new world replays the events of the old one"""
+        self.rng.seed(self.seed)
+        self.blobs.clear()
+        self.frame_count = 0
+        self.point_of_interest = None
+        self.chain_batch = None
+        self.half_edge_graph = None
+        self.timer.reset()